@@ -1,9 +1,23 @@
-import openai
+import argparse
+import asyncio
+import csv
+import json
+import mailbox
+import sys
+import time
+from email.message import Message
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-client = openai.OpenAI(api_key="")
+from batching import batched, run_batches
+from llm_cache import get_default_cache
+from llm_client import achat_completion, chat_completion, run_async
 
-def classify_email(email_text):
-    system_prompt = """
+CATEGORIES = ("Technical Question", "Billing Problem", "Product Feedback")
+BATCH_SIZE = 20
+MAX_CONCURRENCY = 8
+MAX_EMAIL_CHARS = 2000  # limita o tamanho de cada e-mail dentro de um lote
+
+system_prompt = """
 Persona: Você é um classificador de e-mails especializado em suporte ao cliente.
 Task: Classifique o conteúdo de um e-mail de suporte como uma das seguintes categorias:
 - "Technical Question"
@@ -20,6 +34,13 @@ Output format:
 - Apenas a categoria exata, sem explicações.
 """
 
+batch_system_prompt = system_prompt.split("Output format:")[0] + """Output format:
+- Um objeto JSON no formato {"labels": [{"id": <id do e-mail>, "category": "<categoria>"}]}
+- Exatamente um item por e-mail recebido, usando o mesmo id.
+"""
+
+
+def build_messages(email_text):
     user_prompt = f"""
 E-mail:
 \"\"\"
@@ -28,20 +49,190 @@ E-mail:
 
 Classifique este e-mail:
 """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
 
-    response = client.chat.completions.create(
+
+def classify_email(email_text):
+    response = chat_completion(
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
+        messages=build_messages(email_text),
         temperature=0,
-        max_tokens=10
+        max_tokens=10,
+        cache=get_default_cache()
     )
 
-    return response.choices[0].message.content.strip()
+    return response.strip()
+
+
+async def aclassify_email(email_text):
+    response = await achat_completion(
+        model="gpt-4o-mini",
+        messages=build_messages(email_text),
+        temperature=0,
+        max_tokens=10,
+        cache=get_default_cache()
+    )
+
+    return response.strip()
+
+
+def _message_body(message: Message) -> str:
+    if message.is_multipart():
+        for part in message.walk():
+            if part.get_content_type() == "text/plain" and not part.get_filename():
+                return _decode_part(part)
+        return ""
+    return _decode_part(message)
+
+
+def _decode_part(part: Message) -> str:
+    payload = part.get_payload(decode=True)
+    if payload is None:
+        return ""
+    return payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+
+
+def _record_text(record: dict) -> str:
+    text = record.get("text") or record.get("body") or record.get("email") or ""
+    subject = record.get("subject")
+    return f"Assunto: {subject}\n{text}" if subject else text
+
+
+def iter_emails(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """Lê e-mails sob demanda de um arquivo JSONL, CSV ou mbox, gerando (id, texto)"""
+    fmt = fmt or path.rsplit(".", 1)[-1].lower()
+
+    if fmt in ("jsonl", "ndjson", "json"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if line.strip():
+                    record = json.loads(line)
+                    yield str(record.get("id", line_number)), _record_text(record)
+    elif fmt == "csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f)):
+                yield str(row.get("id") or row_number), _record_text(row)
+    elif fmt == "mbox":
+        for index, message in enumerate(mailbox.mbox(path, create=False)):
+            subject = message.get("Subject", "")
+            body = _message_body(message)
+            yield str(message.get("Message-ID") or index), f"Assunto: {subject}\n{body}" if subject else body
+    else:
+        raise ValueError(f"Formato de entrada não suportado: {fmt}")
+
+
+async def classify_batch(batch: List[Tuple[str, str]],
+                         slots: Optional[asyncio.Semaphore] = None) -> List[Tuple[str, Optional[str]]]:
+    """Classifica vários e-mails em uma única requisição com saída JSON por item.
+
+    Itens ausentes ou inválidos (e o lote inteiro, se a chamada falhar) são
+    reclassificados individualmente, em paralelo. A categoria fica None só
+    quando também a chamada individual falha. Toda requisição, do lote ou
+    individual, ocupa uma vaga de `slots`; compartilhado entre os lotes, ele
+    limita o total de chamadas em voo mesmo quando vários lotes caem para o
+    modo individual ao mesmo tempo.
+    """
+    slots = slots or asyncio.Semaphore(MAX_CONCURRENCY)
+    payload = [{"id": i, "email": text[:MAX_EMAIL_CHARS]} for i, (_, text) in enumerate(batch)]
+    labels = {}
+    try:
+        async with slots:
+            response = await achat_completion(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": batch_system_prompt},
+                    {"role": "user", "content": "E-mails:\n" + json.dumps(payload, ensure_ascii=False)}
+                ],
+                temperature=0,
+                max_tokens=30 + 25 * len(batch),  # cada item {"id": .., "category": ".."} tem ~15 tokens
+                response_format={"type": "json_object"}
+            )
+        for item in json.loads(response).get("labels", []):
+            if item.get("category") in CATEGORIES:
+                labels[int(item["id"])] = item["category"]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        pass
+    except Exception as e:
+        print(f"Erro ao classificar lote de {len(batch)} e-mails, classificando um a um: {e}", file=sys.stderr)
+
+    async def classify_one(text):
+        async with slots:
+            return await aclassify_email(text[:MAX_EMAIL_CHARS])
+
+    missing = [i for i in range(len(batch)) if i not in labels]
+    fallbacks = await asyncio.gather(*(classify_one(batch[i][1]) for i in missing), return_exceptions=True)
+    for i, category in zip(missing, fallbacks):
+        if isinstance(category, Exception):
+            print(f"Erro ao classificar o e-mail {batch[i][0]}: {category}", file=sys.stderr)
+            category = None
+        labels[i] = category
+    return [(email_id, labels[i]) for i, (email_id, _) in enumerate(batch)]
+
+
+async def classify_stream(emails: Iterable[Tuple[str, str]], output, batch_size: int = BATCH_SIZE,
+                          concurrency: int = MAX_CONCURRENCY, report_every: float = 5.0) -> int:
+    """Classifica um fluxo de e-mails e escreve os rótulos em JSONL conforme ficam prontos.
+
+    No máximo `concurrency` lotes ficam em voo, então a memória não depende do
+    tamanho da entrada, e no máximo `concurrency` requisições, contando as
+    reclassificações individuais. Todo e-mail da entrada aparece na saída; os que não
+    puderam ser classificados saem com "category": null.
+    """
+    start = time.perf_counter()
+    total = failed = 0
+    slots = asyncio.Semaphore(concurrency)
+
+    def write_results(batch, results, error):
+        nonlocal total, failed
+        if error is not None:
+            print(f"Erro ao classificar lote: {error}", file=sys.stderr)
+            results = [(email_id, None) for email_id, _ in batch]  # registra os ids sem categoria
+        for email_id, category in results:
+            output.write(json.dumps({"id": email_id, "category": category}, ensure_ascii=False) + "\n")
+            if category is None:
+                failed += 1
+        total += len(results)
+        output.flush()
+
+    def report(elapsed):
+        print(f"{total} e-mails classificados ({total / elapsed:.1f} e-mails/s)", file=sys.stderr)
+
+    await run_batches(batched(emails, batch_size), lambda batch: classify_batch(batch, slots), write_results,
+                      concurrency, report, report_every)
+
+    elapsed = time.perf_counter() - start
+    print(f"Total: {total} e-mails em {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} e-mails/s)",
+          file=sys.stderr)
+    if failed:
+        print(f"{failed} e-mails ficaram sem categoria (category null na saída)", file=sys.stderr)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classificador de e-mails de suporte")
+    parser.add_argument("--batch", metavar="ARQUIVO", help="classifica em lote um arquivo JSONL, CSV ou mbox")
+    parser.add_argument("--format", choices=["jsonl", "csv", "mbox"], help="formato da entrada (padrão: extensão)")
+    parser.add_argument("--output", default="-", help="arquivo JSONL de saída (padrão: stdout)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    if not args.batch:
+        email = input("Cole o conteúdo do e-mail:\n")
+        category = classify_email(email)
+        print(f"\nCategoria identificada: {category}")
+        return
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        emails = iter_emails(args.batch, args.format)
+        run_async(classify_stream(emails, output, args.batch_size, args.concurrency))
+    finally:
+        if output is not sys.stdout:
+            output.close()
 
 if __name__ == "__main__":
-    email = input("Cole o conteúdo do e-mail:\n")
-    category = classify_email(email)
-    print(f"\nCategoria identificada: {category}")
+    main()
@@ -1,14 +1,536 @@
-import openai
+import argparse
+import fnmatch
+import glob
+import gzip
+import hashlib
+import heapq
+import json
+import mmap
+import os
 import re
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 
-client = openai.OpenAI(api_key="")
+from llm_cache import get_default_cache
+from llm_client import chat_completion
 
-def extract_errors_from_log(log_path):
-    with open(log_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+ERROR_PATTERN = re.compile(r"(ERROR|Exception|Traceback)")
+MAX_ERROR_LINES = 30
+MAX_TRACEBACK_LINES = 200
+MAX_CLUSTERS = 1000  # limite de grupos mantidos em memória durante a varredura
+TOP_CLUSTERS = 10  # grupos mais frequentes enviados à LLM
+FOLLOW_STATE_FILE = "./.log_follow_state.json"
+POLL_INTERVAL = 1.0  # segundos entre verificações dos arquivos no modo follow
+DEBOUNCE_WINDOW = 5.0  # espera por silêncio antes de analisar um lote de erros novos
+MAX_BATCH_WAIT = 30.0  # tempo máximo que um lote fica acumulando
+FOLLOW_READ_SIZE = 1024 * 1024  # bytes lidos por vez no modo follow
+MAX_LINE_BYTES = 1024 * 1024  # linhas maiores são cortadas (só o conteúdo; os offsets continuam exatos)
+SCAN_BLOCK_SIZE = 4 * 1024 * 1024  # bytes lidos por vez no modo diretório
+SCAN_GLOB = "*.log*"  # arquivos considerados no modo diretório (inclui app.log.1, app.log.2.gz)
 
-    error_lines = [line for line in lines if re.search(r"(ERROR|Exception|Traceback)", line)]
-    return "\n".join(error_lines[-30:])  
+# Literais do ERROR_PATTERN: blocos sem nenhum deles são descartados sem passar pelo regex
+ERROR_LITERALS = (b"ERROR", b"Exception", b"Traceback")
+ERROR_PATTERN_BYTES = re.compile(ERROR_PATTERN.pattern.encode())
+
+TRACEBACK_START = "Traceback (most recent call last):"
+TIMESTAMP_PREFIX = re.compile(r"^\[?\d{4}-\d{2}-\d{2}[T ][\d:.,]+(?:Z|[+-]\d{2}:?\d{2})?\]?\s*")
+NORMALIZERS = [
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<addr>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{6,}\b"), "<id>"),
+    (re.compile(r"\d+"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+def open_log(path):
+    """Abre um log em modo texto, descomprimindo .gz de forma transparente"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+def rotated_log_files(log_path):
+    """Arquivos de um conjunto rotacionado (app.log, app.log.1, app.log.2.gz, ...), do mais novo ao mais antigo"""
+    rotated = [p for p in glob.glob(glob.escape(log_path) + "[.-]*") if os.path.isfile(p)]
+    rotated.sort(key=os.path.getmtime, reverse=True)
+    return ([log_path] if os.path.exists(log_path) else []) + rotated
+
+def read_lines(f, block_size=FOLLOW_READ_SIZE):
+    """Linhas de um arquivo binário lidas em blocos, com no máximo MAX_LINE_BYTES por linha"""
+    partial = b""
+    while True:
+        data = f.read(block_size)
+        if not data:
+            break
+        lines = (partial + data).split(b"\n")
+        partial = lines.pop()[:MAX_LINE_BYTES]
+        for raw in lines:
+            yield raw[:MAX_LINE_BYTES].decode("utf-8", errors="replace").rstrip("\r")
+    if partial:
+        yield partial.decode("utf-8", errors="replace").rstrip("\r")
+
+def iter_log_lines(path):
+    """Lê o log linha a linha sem carregá-lo inteiro na memória"""
+    with open_log(path) as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+def reverse_log_lines(path):
+    """Lê as linhas de um log não comprimido do fim para o começo usando mmap"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            if mm[end - 1:end] == b"\n":
+                end -= 1
+            while end > 0:
+                start = mm.rfind(b"\n", 0, end)
+                yield mm[start + 1:end].decode("utf-8", errors="replace").rstrip("\r")
+                end = start
+
+def tail_matching_lines(path, pattern=ERROR_PATTERN, max_lines=MAX_ERROR_LINES):
+    """Últimas `max_lines` linhas que casam com `pattern`, em ordem cronológica.
+
+    Logs comuns são lidos de trás para frente e a leitura para assim que há
+    linhas suficientes; logs .gz são lidos em streaming com um buffer circular.
+    """
+    if max_lines <= 0:
+        return []
+    if path.endswith(".gz"):
+        buffer = deque(maxlen=max_lines)
+        for line in iter_log_lines(path):
+            if pattern.search(line):
+                buffer.append(line)
+        return list(buffer)
+
+    matches = []
+    for line in reverse_log_lines(path):
+        if pattern.search(line):
+            matches.append(line)
+            if len(matches) == max_lines:
+                break
+    matches.reverse()
+    return matches
+
+def extract_errors_from_log(log_path, max_lines=MAX_ERROR_LINES, include_rotated=False):
+    files = rotated_log_files(log_path) if include_rotated else [log_path]
+    error_lines = []
+    for path in files:  # do mais novo para o mais antigo
+        error_lines = tail_matching_lines(path, ERROR_PATTERN, max_lines - len(error_lines)) + error_lines
+        if len(error_lines) >= max_lines:
+            break
+    return "\n".join(error_lines)
+
+class ErrorEventAssembler:
+    """Agrupa linhas de log em eventos de erro, remontando tracebacks de várias linhas"""
+
+    def __init__(self):
+        self.block = None
+
+    @property
+    def in_block(self):
+        return self.block is not None
+
+    def feed(self, line):
+        if self.block is not None:
+            if line[:1].isspace() or not line.strip():
+                if len(self.block) < MAX_TRACEBACK_LINES:
+                    self.block.append(line)
+                return []
+            self.block.append(line)  # a primeira linha sem indentação é a da exceção
+            event = "\n".join(self.block)
+            self.block = None
+            return [event]
+
+        if TRACEBACK_START in line:
+            self.block = [line]
+        elif ERROR_PATTERN.search(line):
+            return [line]
+        return []
+
+    def flush(self):
+        if self.block is None:
+            return []
+        event = "\n".join(self.block)
+        self.block = None
+        return [event]
+
+def iter_error_events(lines):
+    assembler = ErrorEventAssembler()
+    for line in lines:
+        yield from assembler.feed(line)
+    yield from assembler.flush()
+
+def normalize_error(text):
+    """Remove timestamps, números, endereços e ids para que erros repetidos fiquem iguais"""
+    lines = []
+    for line in text.splitlines():
+        line = TIMESTAMP_PREFIX.sub("", line.strip())
+        for pattern, replacement in NORMALIZERS:
+            line = pattern.sub(replacement, line)
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+def error_fingerprint(text):
+    return hashlib.sha1(normalize_error(text).encode("utf-8")).hexdigest()[:16]
+
+def cluster_errors(events, max_clusters=MAX_CLUSTERS):
+    """Conta eventos por fingerprint guardando o exemplo mais recente de cada grupo.
+
+    Com mais de `max_clusters` grupos, o visto há mais tempo é descartado.
+    """
+    clusters = OrderedDict()
+    for event in events:
+        fingerprint = error_fingerprint(event)
+        cluster = clusters.pop(fingerprint, None) or {"fingerprint": fingerprint, "count": 0}
+        cluster["count"] += 1
+        cluster["representative"] = event
+        clusters[fingerprint] = cluster
+        if len(clusters) > max_clusters:
+            clusters.popitem(last=False)
+    return clusters
+
+def cluster_log(log_path, include_rotated=False, max_clusters=MAX_CLUSTERS):
+    files = rotated_log_files(log_path) if include_rotated else [log_path]
+    lines = (line for path in reversed(files) for line in iter_log_lines(path))  # do mais antigo ao mais novo
+    return cluster_errors(iter_error_events(lines), max_clusters)
+
+def explain_cluster(cluster, cache=None):
+    """Explica um grupo de erros; explicações ficam em cache por fingerprint"""
+    cache = cache or get_default_cache()
+    key = f"error-explanation:{cluster['fingerprint']}"
+    explanation = cache.get(key)
+    if explanation is None:
+        explanation = process_error_with_llm(cluster["representative"])
+        cache.set(key, explanation)
+    return explanation
+
+def _timestamp_key(line):
+    """Timestamp do início da linha em um formato que ordena como texto (ou None)"""
+    match = TIMESTAMP_PREFIX.match(line)
+    if match is None:
+        return None
+    return match.group(0).strip().strip("[]").replace("T", " ").replace(",", ".")
+
+def _candidate_line_starts(block):
+    """Início de cada linha do bloco que contém algum dos ERROR_LITERALS"""
+    starts = set()
+    for literal in ERROR_LITERALS:
+        position = block.find(literal)
+        while position != -1:
+            start = block.rfind(b"\n", 0, position) + 1
+            starts.add(start)
+            end = block.find(b"\n", position)
+            if end == -1:
+                break
+            position = block.find(literal, end)
+    return sorted(starts)
+
+def scan_log_file(path):
+    """Varre um arquivo em blocos binários e devolve (path, bytes lidos, [(timestamp, nº da linha, evento)]).
+
+    Blocos sem nenhum dos literais de erro são pulados só contando quebras de
+    linha; o regex roda apenas nas linhas candidatas. Tracebacks são
+    remontados pelo ErrorEventAssembler: a partir da linha "Traceback" as
+    linhas seguintes são lidas uma a uma, mesmo sem literais, até o fim do
+    bloco de indentação. Eventos sem timestamp herdam o da linha de erro
+    anterior do mesmo arquivo.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    events = []
+    scanned = 0
+    line_number = 1  # número da linha que começa em `position`
+    timestamp = ""
+    remainder = b""
+    assembler = ErrorEventAssembler()
+    block_timestamp, block_line = "", 0  # início do traceback em montagem
+    with opener(path, "rb") as f:
+        while True:
+            data = f.read(SCAN_BLOCK_SIZE)
+            scanned += len(data)
+            if data:
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:  # linha maior que o bloco: continua acumulando
+                    remainder += data
+                    continue
+                block, remainder = remainder + data[:cut], data[cut:]
+            elif remainder:
+                block, remainder = remainder, b""
+            else:
+                break
+
+            if not assembler.in_block and not any(literal in block for literal in ERROR_LITERALS):
+                line_number += block.count(b"\n")
+                continue
+
+            starts = _candidate_line_starts(block)
+            candidate = 0
+            position = 0
+            while position < len(block):
+                if not assembler.in_block:
+                    while candidate < len(starts) and starts[candidate] < position:
+                        candidate += 1
+                    if candidate == len(starts):
+                        break
+                    line_number += block.count(b"\n", position, starts[candidate])
+                    position = starts[candidate]
+                end = block.find(b"\n", position)
+                end = len(block) if end == -1 else end
+                raw = block[position:end]
+                if assembler.in_block or ERROR_PATTERN_BYTES.search(raw):
+                    line = raw.decode("utf-8", errors="replace").rstrip("\r")
+                    if not assembler.in_block:
+                        timestamp = _timestamp_key(line) or timestamp
+                        block_timestamp, block_line = timestamp, line_number
+                    events.extend((block_timestamp, block_line, event) for event in assembler.feed(line))
+                line_number += 1
+                position = end + 1
+            line_number += block.count(b"\n", position)
+
+    events.extend((block_timestamp, block_line, event) for event in assembler.flush())
+    events.sort(key=lambda event: event[0])  # estável: empates mantêm a ordem do arquivo
+    return path, scanned, events
+
+def find_log_files(directory, pattern=SCAN_GLOB):
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files if fnmatch.fnmatch(name, pattern))
+    paths.sort()
+    return paths
+
+def scan_log_directory(directory, pattern=SCAN_GLOB, processes=None):
+    """Varre todos os logs de um diretório em paralelo.
+
+    Retorna um iterador de (timestamp, arquivo, nº da linha, evento) em ordem
+    cronológica, com os arquivos intercalados por heapq.merge, e as
+    estatísticas da varredura.
+    """
+    paths = find_log_files(directory, pattern)
+    processes = processes or os.cpu_count() or 1
+    start = time.perf_counter()
+    if processes == 1 or len(paths) <= 1:
+        results = [scan_log_file(path) for path in paths]
+    else:
+        chunksize = max(1, len(paths) // (processes * 8))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(scan_log_file, paths, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    scanned = sum(result[1] for result in results)
+    stats = {
+        "files": len(paths),
+        "bytes": scanned,
+        "errors": sum(len(result[2]) for result in results),
+        "seconds": elapsed,
+        "mb_per_s": scanned / 1e6 / elapsed if elapsed else 0.0,
+    }
+    streams = [[(ts, path, number, line) for ts, number, line in events] for path, _, events in results]
+    return heapq.merge(*streams), stats
+
+class LogFollower:
+    """Acompanha um arquivo de log (como tail -F) tratando rotação e truncamento.
+
+    `offset` só avança sobre linhas completas e, no meio de um traceback, fica
+    no início dele, então retomar a partir de checkpoint() não perde eventos.
+    Cada leitura traz no máximo FOLLOW_READ_SIZE bytes; `behind` indica que
+    ainda há dados esperando no arquivo.
+    """
+
+    def __init__(self, path, saved=None):
+        self.path = path
+        self.file = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b""
+        self.partial_dropped = 0  # bytes da linha incompleta descartados por passar de MAX_LINE_BYTES
+        self.behind = False
+        self.assembler = ErrorEventAssembler()
+        self.block_start = 0
+        self.saved = saved or {}
+        self.start_at_end = saved is None  # primeira execução: só erros novos, como tail -F
+
+    def _open(self):
+        start_at_end, self.start_at_end = self.start_at_end, False
+        try:
+            self.file = open(self.path, "rb")
+        except FileNotFoundError:
+            return []
+        stat = os.fstat(self.file.fileno())
+        self.inode = stat.st_ino
+        self.offset = 0
+        self.partial = b""
+        self.partial_dropped = 0
+        events = []
+
+        saved_inode, saved_offset = self.saved.get("inode"), self.saved.get("offset", 0)
+        if saved_inode == self.inode and saved_offset <= stat.st_size:
+            self.offset = saved_offset
+        elif saved_inode is not None:
+            events = self._catch_up_rotated(saved_inode, saved_offset)
+        elif start_at_end:
+            self.offset = stat.st_size
+        self.saved = {}
+        self.file.seek(self.offset)
+        self.block_start = self.offset
+        return events
+
+    def _catch_up_rotated(self, inode, offset):
+        """Lê o que faltou do arquivo antigo, se ele foi rotacionado enquanto estávamos parados"""
+        for path in rotated_log_files(self.path)[1:]:
+            if path.endswith(".gz") or os.stat(path).st_ino != inode:
+                continue
+            with open(path, "rb") as old:
+                old.seek(offset)
+                return list(iter_error_events(read_lines(old)))
+        return []
+
+    def _read_available(self):
+        events = []
+        data = self.file.read(FOLLOW_READ_SIZE)
+        self.behind = len(data) == FOLLOW_READ_SIZE
+        if not data:
+            return events
+        lines = (self.partial + data).split(b"\n")
+        tail = lines.pop()
+        position = self.offset
+        for raw in lines:
+            line = raw[:MAX_LINE_BYTES].decode("utf-8", errors="replace").rstrip("\r")
+            if not self.assembler.in_block:
+                self.block_start = position
+            position += len(raw) + 1 + self.partial_dropped
+            self.partial_dropped = 0
+            events.extend(self.assembler.feed(line))
+            if not self.assembler.in_block:
+                self.block_start = position
+        if len(tail) > MAX_LINE_BYTES:
+            self.partial_dropped += len(tail) - MAX_LINE_BYTES
+            tail = tail[:MAX_LINE_BYTES]
+        self.partial = tail
+        self.offset = position
+        return events
+
+    def _drain(self):
+        """Lê, em blocos, tudo o que falta no arquivo aberto"""
+        events = self._read_available()
+        while self.behind:
+            events.extend(self._read_available())
+        return events
+
+    def poll(self):
+        """Retorna os eventos de erro que apareceram desde a última chamada"""
+        if self.file is None:
+            events = self._open()
+            if self.file is None:
+                return events
+        else:
+            events = []
+
+        events.extend(self._read_available())
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:  # rotacionado e ainda não recriado
+            return events
+
+        if stat.st_ino != self.inode:  # rotação: termina o arquivo antigo e abre o novo
+            events.extend(self._drain())
+            events.extend(self.assembler.flush())
+            self.close()
+            events.extend(self._open())
+            events.extend(self._read_available())
+        elif stat.st_size < self.offset + len(self.partial) + self.partial_dropped:  # truncado
+            self.file.seek(0)
+            self.offset = self.block_start = 0
+            self.partial = b""
+            self.partial_dropped = 0
+            self.assembler = ErrorEventAssembler()
+            events.extend(self._read_available())
+        return events
+
+    def checkpoint(self):
+        offset = self.block_start if self.assembler.in_block else self.offset
+        return {"inode": self.inode, "offset": offset} if self.inode is not None else self.saved
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def _load_follow_state(state_file):
+    if os.path.exists(state_file):
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def _save_follow_state(state_file, followers):
+    tmp_path = state_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({follower.path: follower.checkpoint() for follower in followers}, f)
+    os.replace(tmp_path, state_file)
+
+def report_new_errors(events):
+    """Agrupa um lote de eventos e explica só os grupos ainda não analisados"""
+    cache = get_default_cache()
+    for cluster in cluster_errors(events).values():
+        known = cache.get(f"error-explanation:{cluster['fingerprint']}") is not None
+        print(f"=== {cluster['count']} nova(s) ocorrência(s) [{cluster['fingerprint']}]")
+        if known:
+            print("(grupo já analisado anteriormente)\n")
+            continue
+        print(cluster["representative"])
+        print()
+        print(explain_cluster(cluster, cache))
+        print()
+
+def follow_logs(paths, state_file=FOLLOW_STATE_FILE, poll_interval=POLL_INTERVAL,
+                debounce=DEBOUNCE_WINDOW, max_wait=MAX_BATCH_WAIT):
+    """Acompanha os logs continuamente e analisa erros novos em lotes (debounce).
+
+    Os offsets são salvos em `state_file` sempre que não há eventos pendentes,
+    então após reiniciar a leitura continua exatamente de onde parou. Se a
+    análise falhar (rede, API), o lote continua pendente e é tentado de novo
+    após outra janela de debounce.
+    """
+    saved = _load_follow_state(state_file)
+    followers = [LogFollower(path, saved.get(path)) for path in paths]
+    pending = []
+    first_event = last_event = 0.0
+    last_saved = None
+
+    try:
+        while True:
+            now = time.monotonic()
+            for follower in followers:
+                events = follower.poll()
+                if events:
+                    if not pending:
+                        first_event = now
+                    last_event = now
+                    pending.extend(events)
+
+            if pending and (now - last_event >= debounce or now - first_event >= max_wait):
+                try:
+                    report_new_errors(pending)
+                except Exception as e:
+                    print(f"Erro ao analisar {len(pending)} evento(s) novo(s), nova tentativa em breve: {e}",
+                          file=sys.stderr)
+                    first_event = last_event = now
+                else:
+                    pending = []
+
+            if not pending:
+                checkpoint = [f.checkpoint() for f in followers]
+                if checkpoint != last_saved:
+                    _save_follow_state(state_file, followers)
+                    last_saved = checkpoint
+
+            if not any(follower.behind for follower in followers):  # com arquivo atrasado, lê o próximo bloco sem esperar
+                time.sleep(poll_interval)
+    finally:
+        for follower in followers:
+            follower.close()
 
 def process_error_with_llm(error_text):
     system_prompt = """
@@ -35,7 +557,7 @@ A seguir estão mensagens de erro extraídas de um log de aplicação:
 Explique o problema e sugira uma solução:
 """
 
-    response = client.chat.completions.create(
+    response = chat_completion(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -45,15 +567,78 @@ Explique o problema e sugira uma solução:
         max_tokens=800
     )
 
-    return response.choices[0].message.content.strip()
+    return response.strip()
 
-if __name__ == "__main__":
-    log_file_path = "./app.log"  
+def main():
+    parser = argparse.ArgumentParser(description="Explica os erros de um log com IA")
+    parser.add_argument("log_file_path", nargs="?", default="./app.log")
+    parser.add_argument("--follow", nargs="*", metavar="LOG",
+                        help="acompanha o log (e outros LOGs opcionais) continuamente, como tail -F")
+    parser.add_argument("--state-file", default=FOLLOW_STATE_FILE)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_WINDOW)
+    parser.add_argument("--rotated", action="store_true", help="inclui app.log.1, app.log.2.gz, ...")
+    parser.add_argument("--top", type=int, default=TOP_CLUSTERS, help="grupos de erro mais frequentes a explicar")
+    parser.add_argument("--tail", action="store_true",
+                        help="modo antigo: envia as últimas --max-lines linhas de erro em um único bloco")
+    parser.add_argument("--max-lines", type=int, default=MAX_ERROR_LINES)
+    parser.add_argument("--dir", metavar="DIRETORIO",
+                        help="varre todos os logs do diretório em paralelo e imprime os erros em ordem cronológica")
+    parser.add_argument("--glob", default=SCAN_GLOB, help="padrão de nome dos arquivos no modo --dir")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--explain", action="store_true",
+                        help="no modo --dir, agrupa os erros e explica os --top grupos mais frequentes")
+    args = parser.parse_args()
 
-    errors = extract_errors_from_log(log_file_path)
-    if errors:
-        explanation = process_error_with_llm(errors)
-        print(explanation)
-    else:
+    if args.dir:
+        stream, stats = scan_log_directory(args.dir, args.glob, args.processes)
+        events = []
+        for _, path, number, event in stream:
+            print(f"{os.path.relpath(path, args.dir)}:{number}: {event}")
+            if args.explain:
+                events.append(event)
+        print(f"{stats['errors']} eventos de erro em {stats['files']} arquivos, "
+              f"{stats['bytes'] / 1e6:.1f} MB em {stats['seconds']:.2f}s ({stats['mb_per_s']:.1f} MB/s)",
+              file=sys.stderr)
+        if args.explain and events:
+            clusters = cluster_errors(events)  # tracebacks completos, não só a linha "Traceback"
+            for cluster in sorted(clusters.values(), key=lambda c: c["count"], reverse=True)[:args.top]:
+                print(f"\n=== {cluster['count']} ocorrência(s) [{cluster['fingerprint']}]")
+                print(cluster["representative"])
+                print()
+                print(explain_cluster(cluster))
+        return
+
+    if args.follow is not None:
+        paths = [args.log_file_path] + [p for p in args.follow if p != args.log_file_path]
+        try:
+            follow_logs(paths, args.state_file, debounce=args.debounce)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.tail:
+        errors = extract_errors_from_log(args.log_file_path, args.max_lines, args.rotated)
+        if errors:
+            explanation = process_error_with_llm(errors)
+            print(explanation)
+        else:
+            print("Nenhum erro identificado no log.")
+        return
+
+    clusters = cluster_log(args.log_file_path, args.rotated)
+    if not clusters:
         print("Nenhum erro identificado no log.")
+        return
+
+    total = sum(c["count"] for c in clusters.values())
+    print(f"{total} erros em {len(clusters)} grupos distintos\n")
+    for cluster in sorted(clusters.values(), key=lambda c: c["count"], reverse=True)[:args.top]:
+        print(f"=== {cluster['count']} ocorrência(s) [{cluster['fingerprint']}]")
+        print(cluster["representative"])
+        print()
+        print(explain_cluster(cluster))
+        print()
+
+if __name__ == "__main__":
+    main()
     
\ No newline at end of file
@@ -1,24 +1,167 @@
-import openai
-import requests
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
 import time
 
-client = openai.OpenAI(api_key="")
+import httpx
+import openai
+
+from llm_client import achat_completion, aclose_clients
+
 STATUS_PAGE_API = "https://www.githubstatus.com/api/v2/incidents.json"  
+FEEDS = [  # feeds compatíveis com o Statuspage (/api/v2/incidents.json)
+    STATUS_PAGE_API,
+    "https://www.cloudflarestatus.com/api/v2/incidents.json",
+    "https://status.atlassian.com/api/v2/incidents.json",
+    "https://discordstatus.com/api/v2/incidents.json",
+]
 CHECK_INTERVAL = 60 
+ACTIVE_INTERVAL = 15  # intervalo enquanto o feed tem incidente não resolvido
+MAX_INTERVAL = 600  # teto do intervalo de um feed sem mudanças
+BACKOFF_FACTOR = 1.5  # multiplicador do intervalo a cada verificação sem novidade
+REQUEST_TIMEOUT = 20
+LLM_CONCURRENCY = 4
+RESOLVED_STATUSES = ("resolved", "postmortem", "completed")
+STATE_DB = "./.incident_state.sqlite"
+STATE_MAX_AGE = 90 * 24 * 3600  # incidentes fora do feed há mais tempo que isso são esquecidos
+EVICT_INTERVAL = 3600  # segundos entre limpezas do estado
+
+class IncidentStore:
+    """Incidentes já processados (id -> id da última atualização vista), persistidos em SQLite.
+
+    Substitui o set em memória: o estado sobrevive a reinícios e entradas que
+    saíram do feed há mais de `max_age` segundos são removidas, então o
+    tamanho fica limitado ao que o feed mostra nesse período.
+    """
+
+    def __init__(self, path=STATE_DB, max_age=STATE_MAX_AGE):
+        self.max_age = max_age
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS incidents (
+                id TEXT PRIMARY KEY,
+                last_update_id TEXT,
+                summary TEXT,
+                first_seen_at REAL NOT NULL,
+                last_seen_at REAL NOT NULL
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(incidents)")}
+        if "summary" not in columns:  # bancos criados antes dos resumos incrementais
+            self._conn.execute("ALTER TABLE incidents ADD COLUMN summary TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_incidents_seen ON incidents(last_seen_at)")
+        self._conn.commit()
+
+    def get(self, incident_id):
+        row = self._conn.execute(
+            "SELECT last_update_id, summary FROM incidents WHERE id = ?", (incident_id,)
+        ).fetchone()
+        return {"last_update_id": row[0], "summary": row[1]} if row else None
+
+    def mark(self, incident_id, last_update_id, summary=None):
+        now = time.time()
+        self._conn.execute(
+            """INSERT INTO incidents (id, last_update_id, summary, first_seen_at, last_seen_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET last_update_id = excluded.last_update_id,
+                                             summary = COALESCE(excluded.summary, incidents.summary),
+                                             last_seen_at = excluded.last_seen_at""",
+            (incident_id, last_update_id, summary, now, now)
+        )
+        self._conn.commit()
+
+    def touch(self, incident_ids):
+        """Marca os incidentes ainda presentes no feed para que não expirem"""
+        now = time.time()
+        self._conn.executemany("UPDATE incidents SET last_seen_at = ? WHERE id = ?",
+                               [(now, incident_id) for incident_id in incident_ids])
+        self._conn.commit()
+
+    def evict(self):
+        cursor = self._conn.execute("DELETE FROM incidents WHERE last_seen_at < ?", (time.time() - self.max_age,))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self._conn.close()
+
+def latest_update_id(incident):
+    updates = incident.get("incident_updates") or []
+    return updates[0].get("id") if updates else None  # o Statuspage lista da mais nova para a mais antiga
+
+def new_updates(incident, last_update_id):
+    """Atualizações posteriores a `last_update_id`, da mais antiga para a mais nova"""
+    updates = []
+    for update in incident.get("incident_updates") or []:
+        if last_update_id is not None and update.get("id") == last_update_id:
+            break
+        updates.append(update)
+    updates.reverse()
+    return updates
+
+def format_updates(updates):
+    return "\n\n".join(
+        f"[{update.get('created_at', '')}] {update.get('status', '')}: {update.get('body', '')}"
+        for update in updates
+    )
+
+class FeedPoller:
+    """Estado de um feed: validadores HTTP, intervalo atual e contadores"""
 
-seen_incident_ids = set() #Armazenar incidentes já processados
+    def __init__(self, url):
+        self.url = url
+        self.etag = None
+        self.last_modified = None
+        self.interval = CHECK_INTERVAL
+        self.active = False  # algum incidente do feed ainda não foi resolvido
+        self.incident_ids = []
+        self.stats = {"requests": 0, "not_modified": 0, "bytes": 0, "errors": 0}
 
-def fetch_incidents():
-    response = requests.get(STATUS_PAGE_API)
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def next_interval(self, changed):
+        """Encurta o intervalo com incidente ativo e recua enquanto o feed fica parado"""
+        if self.active:
+            self.interval = ACTIVE_INTERVAL
+        elif changed:
+            self.interval = CHECK_INTERVAL
+        else:
+            self.interval = min(max(self.interval, CHECK_INTERVAL) * BACKOFF_FACTOR, MAX_INTERVAL)
+        return self.interval * random.uniform(0.9, 1.1)  # jitter para os feeds não acordarem juntos
+
+async def fetch_incidents(client, poller):
+    """Busca o feed com GET condicional; retorna None quando não mudou (304)"""
+    response = await client.get(poller.url, headers=poller.conditional_headers())
+    poller.stats["requests"] += 1
+    poller.stats["bytes"] += len(response.content)
+    if response.status_code == 304:
+        poller.stats["not_modified"] += 1
+        return None
     if response.status_code == 200:
+        poller.etag = response.headers.get("ETag")
+        poller.last_modified = response.headers.get("Last-Modified")
         return response.json().get("incidents", [])
     else:
-        print(f"Erro ao acessar API: {response.status_code}")
+        print(f"Erro ao acessar API ({poller.url}): {response.status_code}")
+        poller.stats["errors"] += 1
         return []
 
-def summarize_incident_with_llm(incident):
+async def summarize_incident_with_llm(incident, updates=None, previous_summary=None):
+    """Resume um incidente novo ou, com `previous_summary`, atualiza o resumo só com `updates`"""
     title = incident.get("name", "")
-    body = incident.get("incident_updates", [{}])[0].get("body", "")
+    if updates is None:
+        updates = new_updates(incident, None)
+    body = format_updates(updates)
     
     system_prompt = """
 Persona: Você é um analista de incidentes de TI que gera relatórios executivos.
@@ -40,9 +183,23 @@ Detalhes técnicos:
 \"\"\"
 {body}
 \"\"\"
+"""
+    if previous_summary:
+        user_prompt = f"""
+Resumo anterior do incidente:
+\"\"\"
+{previous_summary}
+\"\"\"
+
+Novas atualizações do incidente "{title}":
+\"\"\"
+{body}
+\"\"\"
+
+Atualize o resumo considerando as novas atualizações, no mesmo formato.
 """
 
-    response = client.chat.completions.create(
+    response = await achat_completion(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -52,18 +209,86 @@ Detalhes técnicos:
         max_tokens=500
     )
 
-    return response.choices[0].message.content.strip()
+    return response.strip()
+
+def is_active(incident):
+    return incident.get("status") not in RESOLVED_STATUSES
+
+async def process_incidents(store, incidents, source, llm_slots):
+    """Resume incidentes novos e atualizações novas; retorna se houve alguma novidade"""
+    changed = False
+    for incident in incidents:
+        state = store.get(incident["id"])
+        if state is None:
+            label, updates, previous = "incidente detectado", None, None
+        else:
+            updates = new_updates(incident, state["last_update_id"])
+            if not updates:
+                continue
+            label, previous = "incidente atualizado", state["summary"]
+        async with llm_slots:
+            summary = await summarize_incident_with_llm(incident, updates, previous)
+        print(f"{label} ({source})")
+        print(summary)
+        store.mark(incident["id"], latest_update_id(incident), summary)  # só depois do resumo feito
+        changed = True
+    return changed
 
-def monitor():
+async def watch_feed(client, store, poller, llm_slots):
+    source = httpx.URL(poller.url).host
     while True:
-        incidents = fetch_incidents()
-        for incident in incidents:
-            if incident["id"] not in seen_incident_ids:
-                seen_incident_ids.add(incident["id"])
-                print("incidente detectado")
-                summary = summarize_incident_with_llm(incident)
-                print(summary)
-        time.sleep(CHECK_INTERVAL)
+        changed = False
+        try:
+            incidents = await fetch_incidents(client, poller)
+            if incidents is not None:  # None: 304, o feed continua como na última leitura
+                poller.incident_ids = [incident["id"] for incident in incidents]
+                poller.active = any(is_active(incident) for incident in incidents)
+                changed = await process_incidents(store, incidents, source, llm_slots)
+            store.touch(poller.incident_ids)
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Erro ao acessar API ({poller.url}): {e}")
+            poller.stats["errors"] += 1
+        except Exception as e:  # LLM (openai.OpenAIError) ou estado: o erro fica neste feed, os outros seguem
+            kind = "ao resumir incidentes" if isinstance(e, openai.OpenAIError) else "inesperado"
+            print(f"Erro {kind} ({poller.url}): {e}")
+            poller.stats["errors"] += 1
+            # sem validadores, a próxima leitura é completa e os incidentes não resumidos são refeitos
+            poller.etag = poller.last_modified = None
+        await asyncio.sleep(poller.next_interval(changed))
+
+async def evict_periodically(store):
+    while True:
+        await asyncio.sleep(EVICT_INTERVAL)
+        store.evict()
+
+async def monitor(feeds=FEEDS):
+    """Acompanha todos os feeds em um único event loop, cada um no seu próprio ritmo"""
+    store = IncidentStore()
+    pollers = [FeedPoller(url) for url in feeds]
+    llm_slots = asyncio.Semaphore(LLM_CONCURRENCY)
+    limits = httpx.Limits(max_connections=len(feeds), max_keepalive_connections=len(feeds))
+    try:
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, limits=limits, follow_redirects=True) as client:
+            await asyncio.gather(
+                evict_periodically(store),
+                *(watch_feed(client, store, poller, llm_slots) for poller in pollers)
+            )
+    finally:
+        for poller in pollers:
+            stats = poller.stats
+            print(f"{poller.url}: {stats['requests']} requisições, {stats['not_modified']} sem mudança (304), "
+                  f"{stats['bytes'] / 1024:.0f} KB, {stats['errors']} erros")
+        store.close()
+        await aclose_clients()
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitora páginas de status e resume incidentes com IA")
+    parser.add_argument("feeds", nargs="*", default=FEEDS, help="URLs de feeds /api/v2/incidents.json")
+    args = parser.parse_args()
+    try:
+        asyncio.run(monitor(args.feeds))
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
-    monitor()
+    main()
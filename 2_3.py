@@ -1,15 +1,56 @@
+import argparse
+import asyncio
+import hashlib
+import json
 import os
-import requests
-from urllib.parse import urljoin, urlparse
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 from bs4 import BeautifulSoup
 import html2text
+import httpx
 
-import openai
+try:
+    import lxml.html
+except ImportError:  # lxml é opcional; sem ele usamos o html.parser do BeautifulSoup
+    lxml = None
 
-client = openai.OpenAI(api_key="")
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:  # sem tiktoken, estimamos ~4 caracteres por token
+    _encoding = None
+
+from doc_store import FileStore, ShardedDocStore
+from llm_cache import get_default_cache
+from llm_client import achat_completion, run_async
 
 BASE_URL = "https://requests.readthedocs.io/en/latest/"
 OUTPUT_DIR = "./docs_md"
+STORE_DIR = "./docs_store"  # usado com --store sharded
+
+MAX_DEPTH = 5
+MAX_PAGES = 1000
+CONCURRENCY = 10
+PER_HOST_CONCURRENCY = 4
+PER_HOST_DELAY = 0.0  # intervalo mínimo (s) entre requisições ao mesmo host
+REQUEST_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+# checkpoint e índice de páginas ficam dentro do diretório do store: validadores e páginas
+# concluídas de um store não valem para outro
+CHECKPOINT_FILENAME = ".crawl_state.json"
+PAGE_INDEX_FILENAME = ".page_index.json"
+CHECKPOINT_EVERY = 25  # páginas entre checkpoints
+KEEP_QUERY = False  # em sites de documentação a query string quase nunca muda o conteúdo
+TRACKING_PARAMS = ("utm_", "highlight", "ref")
+SUMMARY_WORKERS = 4
+SUMMARY_QUEUE_SIZE = 50  # páginas aguardando resumo antes de o rastreamento esperar
+PARSER = "lxml" if lxml is not None else "html.parser"
+PARSE_PROCESSES = os.cpu_count() or 1  # 0 = parse e conversão no próprio event loop
+SINGLE_PASS_TOKENS = 3000  # páginas até esse tamanho são resumidas em uma chamada
+SECTION_TOKEN_BUDGET = 1500  # tamanho máximo de cada bloco no map
+SECTION_CONCURRENCY = 4  # chamadas simultâneas por página
 
 #conversor 
 html_converter = html2text.HTML2Text()
@@ -18,62 +59,408 @@ html_converter.ignore_images = False
 html_converter.bypass_tables = False
 html_converter.body_width = 0
 
-visited = set()
+def normalize_url(url, keep_query=KEEP_QUERY):
+    """Forma canônica da URL usada para deduplicar páginas"""
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    path = parsed.path or "/"
+    if path.endswith("/index.html"):
+        path = path[:-len("index.html")]
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = ""
+    if keep_query:
+        params = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                  if not k.startswith(TRACKING_PARAMS)]
+        query = urlencode(sorted(params))
 
-def save_markdown(markdown_text, path):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(markdown_text)
+    return urlunparse((scheme, netloc, path, "", query, ""))
 
 def clean_filename(url):
     parsed = urlparse(url)
     path = parsed.path.strip("/").replace("/", "_")
     if not path:
         path = "index"
+    if parsed.query:  # variantes de query viram arquivos distintos em vez de se sobrescreverem
+        path = f"{path}_{hashlib.sha1(parsed.query.encode()).hexdigest()[:8]}"
     return f"{path}.md"
 
 def is_valid_subpage(link, domain):
     parsed = urlparse(link)
     return (parsed.netloc == domain or parsed.netloc == '') and not link.endswith(('.pdf', '.jpg', '.png', '.zip'))
 
-def scrape_page(url, domain):
-    if url in visited:
-        return
+class CrawlState:
+    """Fronteira e páginas concluídas, salvas em disco para retomar o rastreamento"""
+
+    def __init__(self, path=os.path.join(OUTPUT_DIR, CHECKPOINT_FILENAME)):
+        self.path = path
+        self.done = set()
+        self.pending = {}  # url normalizada -> (url, profundidade)
+
+    def __len__(self):
+        return len(self.done) + len(self.pending)
+
+    def add(self, url, depth):
+        key = normalize_url(url)
+        if key in self.done or key in self.pending:
+            return False
+        self.pending[key] = (url, depth)
+        return True
+
+    def finish(self, url):
+        key = normalize_url(url)
+        self.pending.pop(key, None)
+        self.done.add(key)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.done = set(data.get("done", []))
+        self.pending = {normalize_url(url): (url, depth) for url, depth in data.get("pending", [])}
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"done": sorted(self.done), "pending": list(self.pending.values())}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class PageIndex:
+    """Metadados por URL (ETag, Last-Modified, hash do conteúdo, links) entre execuções"""
+
+    def __init__(self, path=os.path.join(OUTPUT_DIR, PAGE_INDEX_FILENAME)):
+        self.path = path
+        self.pages = {}
+        self.stats = {"changed": 0, "unchanged": 0, "not_modified": 0}
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.pages = json.load(f)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url):
+        return self.pages.get(normalize_url(url), {})
+
+    def conditional_headers(self, url, store):
+        """If-None-Match/If-Modified-Since só se o store tem a página e o resumo, já que um 304 não traz conteúdo"""
+        entry = self.get(url)
+        page_url = entry.get("page_url", normalize_url(url))
+        filename = clean_filename(page_url)
+        if not (store.has(page_url, filename) and store.has(page_url, filename, "summary")):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url, **fields):
+        self.pages.setdefault(normalize_url(url), {}).update(fields)
 
-    visited.add(url)
+class StageTimer:
+    """Acumula o tempo gasto em cada etapa do pipeline (somado entre workers)"""
 
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+
+    def add(self, stage, seconds):
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def report(self, wall_time):
+        print(f"\nTempo por etapa (total de parede: {wall_time:.1f}s)")
+        for stage, total in self.totals.items():
+            count = self.counts[stage]
+            print(f"  {stage:<12} {total:8.2f}s em {count:5d} chamadas ({total / count * 1000:.0f} ms/chamada)")
+
+class HostPoliteness:
+    """Limita requisições simultâneas e espaça requisições por host"""
+
+    def __init__(self, max_concurrency=PER_HOST_CONCURRENCY, delay=PER_HOST_DELAY):
+        self.max_concurrency = max_concurrency
+        self.delay = delay
+        self.semaphores = {}
+        self.next_slot = {}
+
+    @asynccontextmanager
+    async def slot(self, host):
+        semaphore = self.semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrency))
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = start + self.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+def _extract_lxml(html):
+    try:
+        doc = lxml.html.fromstring(html)
+    except ValueError:  # documento com declaração de encoding
+        doc = lxml.html.fromstring(html.encode("utf-8"))
+    main = doc.xpath('//div[@role="main"]')
+    main_html = lxml.html.tostring(main[0], encoding="unicode", with_tail=False) if main else None
+    return doc.xpath("//a/@href"), main_html
+
+def _extract_soup(html):
+    soup = BeautifulSoup(html, "html.parser")
+    main = soup.find("div", {"role": "main"})
+    return [a["href"] for a in soup.find_all("a", href=True)], str(main) if main else None
+
+def extract_page(html, base_url, domain, previous_hash=None, parser=PARSER):
+    """Extrai links e conteúdo principal e converte para Markdown se o conteúdo mudou.
+
+    Feita para rodar no pool de processos. Retorna (links, content_hash,
+    markdown, tempo_parse, tempo_conversao); content_hash é None sem
+    div[role=main] e markdown é None quando o hash é igual a previous_hash.
+    """
+    start = time.perf_counter()
+    hrefs, main_html = (_extract_lxml if parser == "lxml" else _extract_soup)(html)
+    links = []
+    for href in hrefs:
+        full_url = urljoin(base_url, href)
+        if is_valid_subpage(full_url, domain):
+            links.append(full_url)
+    parsed = time.perf_counter()
+
+    if main_html is None:
+        return links, None, None, parsed - start, 0.0
+    content_hash = hashlib.sha256(main_html.encode("utf-8")).hexdigest()
+    if content_hash == previous_hash:
+        return links, content_hash, None, parsed - start, 0.0
+
+    markdown = html_converter.handle(main_html)
+    return links, content_hash, markdown, parsed - start, time.perf_counter() - parsed
+
+async def scrape_page(session, politeness, url, domain, index, store, summaries, timer, pool=None, parser=PARSER):
+    """Baixa, converte e salva uma página; retorna (links internos, resumo enfileirado).
+
+    Usa GET condicional e o hash do conteúdo principal para pular conversão e
+    resumo de páginas que não mudaram desde a última execução. O resumo é
+    enfileirado em `summaries` e feito pelos workers de resumo, que marcam a
+    página como concluída.
+    """
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
+        async with politeness.slot(urlparse(url).netloc):
+            with timer.measure("fetch"):
+                response = await session.get(url, headers=index.conditional_headers(url, store))
+        if response.status_code == 304:
+            index.stats["not_modified"] += 1
+            return index.get(url).get("links", []), False
+        if response.status_code != 200:
+            print(f"Erro ao acessar {url}: status {response.status_code}")
+            return [], False
+        base_url = str(response.url)  # após redirecionamentos
+        page_url = normalize_url(base_url)
+        filename = clean_filename(page_url)
+        previous_hash = index.get(url).get("content_hash") if store.has(page_url, filename) else None
+
+        #Extrair links e converter para Markdown (no pool de processos, se houver)
+        args = (response.text, base_url, domain, previous_hash, parser)
+        if pool is not None:
+            result = await asyncio.get_running_loop().run_in_executor(pool, extract_page, *args)
+        else:
+            result = extract_page(*args)
+        links, content_hash, markdown, parse_time, convert_time = result
+        timer.add("parse", parse_time)
+        if markdown is not None:
+            timer.add("convert", convert_time)
     except Exception as e:
         print(f"Erro ao acessar {url}: {e}")
-        return
+        return [], False
 
-    main_content = soup.find("div", {"role": "main"}) #Converter para Markdown
-    if not main_content:
+    # ETag e Last-Modified só são gravados quando não há resumo pendente: com eles
+    # a próxima execução recebe 304 e nunca tentaria de novo um resumo que falhou
+    validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    index.update(url, links=links, page_url=page_url)
+
+    if content_hash is None:
         print(f"Conteúdo não encontrado em {url}")
-        return
+        index.update(url, **validators)
+        return links, False
 
-    markdown = html_converter.handle(str(main_content))
-    filename = clean_filename(urljoin(BASE_URL, url))
-    filepath = os.path.join(OUTPUT_DIR, filename)
-    
-    save_markdown(markdown, filepath) #Salvar o conteúdo em mark
+    if markdown is None:
+        index.stats["unchanged"] += 1
+        index.update(url, **validators)
+        return links, False
 
-    summary = summarize_markdown(markdown)
-    if summary:
-        summary_path = filepath.replace(".md", ".summary.md")
-        save_markdown(summary, summary_path) #Salvar o resumo da llm
+    store.put(page_url, filename, "markdown", markdown) #Salvar o conteúdo em mark
 
+    with timer.measure("queue_wait"):  # backpressure quando os resumos estão atrasados
+        await summaries.put((url, page_url, filename, markdown, content_hash, validators))
 
-    for a in soup.find_all("a", href=True):
-        href = a['href']
-        full_url = urljoin(url, href)
-        if is_valid_subpage(full_url, urlparse(BASE_URL).netloc):
-            scrape_page(full_url, domain)
+    index.stats["changed"] += 1
+    return links, True
 
-def summarize_markdown(markdown_text):
-    system_prompt = """
+async def summary_worker(summaries, index, store, timer, on_done=None):
+    while True:
+        url, page_url, filename, markdown, content_hash, validators = await summaries.get()
+        try:
+            with timer.measure("summarize"):
+                summary = await asummarize_markdown(markdown)
+            if summary:
+                store.put(page_url, filename, "summary", summary) #Salvar o resumo da llm
+                # sem resumo, nem hash nem validadores são gravados e a página é reprocessada na próxima vez
+                index.update(url, content_hash=content_hash, **validators)
+        except Exception as e:
+            print(f"Erro ao salvar resumo de {url}: {e}")
+        finally:
+            if on_done is not None:
+                on_done(url)
+            summaries.task_done()
+
+async def fetch_sitemap_urls(session, start_url, max_sitemaps=50):
+    """Lê sitemap.xml (e índices de sitemaps) e retorna as URLs sob start_url"""
+    parsed = urlparse(start_url)
+    prefix = normalize_url(start_url)
+    to_fetch = [urljoin(start_url, "sitemap.xml"), f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"]
+    fetched = set()
+    urls = []
+
+    while to_fetch and len(fetched) < max_sitemaps:
+        sitemap_url = to_fetch.pop(0)
+        if sitemap_url in fetched:
+            continue
+        fetched.add(sitemap_url)
+        try:
+            response = await session.get(sitemap_url)
+            if response.status_code != 200:
+                continue
+            root = ET.fromstring(response.content)
+        except Exception:
+            continue
+
+        locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+        if root.tag.endswith("sitemapindex"):
+            to_fetch.extend(locs)
+        else:
+            urls.extend(loc for loc in locs if normalize_url(loc).startswith(prefix))
+
+    return urls
+
+async def crawl(start_url, max_depth=MAX_DEPTH, max_pages=MAX_PAGES, concurrency=CONCURRENCY,
+                per_host=PER_HOST_CONCURRENCY, delay=PER_HOST_DELAY, use_sitemap=True, resume=True,
+                summary_workers=SUMMARY_WORKERS, summary_queue_size=SUMMARY_QUEUE_SIZE,
+                parser=PARSER, processes=PARSE_PROCESSES, store=None):
+    """Rastreia o site em largura a partir de uma fila, com `concurrency` workers.
+
+    Download/conversão e resumo rodam em etapas separadas ligadas por uma fila
+    limitada, então o rastreamento não espera a LLM a cada página. O estado é
+    salvo periodicamente em CHECKPOINT_FILENAME, no diretório do store; um
+    rastreamento interrompido continua de onde parou na próxima execução.
+    Uma página só conta como concluída depois que o resumo dela é gravado,
+    então resumos ainda na fila são refeitos na retomada.
+    """
+    started = time.perf_counter()
+    domain = urlparse(start_url).netloc
+    queue = asyncio.Queue()
+    summaries = asyncio.Queue(maxsize=summary_queue_size)
+    timer = StageTimer()
+    politeness = HostPoliteness(max_concurrency=per_host, delay=delay)
+    if store is None:
+        store = FileStore(OUTPUT_DIR)
+    state = CrawlState(os.path.join(store.directory, CHECKPOINT_FILENAME))
+    index = PageIndex(os.path.join(store.directory, PAGE_INDEX_FILENAME))
+    index.load()
+
+    pool = ProcessPoolExecutor(max_workers=processes) if processes > 0 else None
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=REQUEST_TIMEOUT, follow_redirects=True) as session:
+        if resume and state.load():
+            print(f"Retomando rastreamento: {len(state.done)} concluídas, {len(state.pending)} pendentes")
+        else:
+            state.add(start_url, 0)
+            if use_sitemap:
+                sitemap_urls = await fetch_sitemap_urls(session, start_url)
+                for url in sitemap_urls[:max_pages]:
+                    state.add(url, 0)
+                if sitemap_urls:
+                    print(f"{len(sitemap_urls)} URLs encontradas no sitemap")
+
+        for url, depth in state.pending.values():
+            queue.put_nowait((url, depth))
+
+        def finish(url):
+            state.finish(url)
+            if len(state.done) % CHECKPOINT_EVERY == 0:
+                state.save()
+                index.save()
+
+        async def worker():
+            while True:
+                url, depth = await queue.get()
+                summarizing = False
+                try:
+                    links, summarizing = await scrape_page(session, politeness, url, domain, index, store,
+                                                           summaries, timer, pool, parser)
+                    if depth < max_depth:
+                        for link in links:
+                            if len(state) < max_pages and state.add(link, depth + 1):
+                                queue.put_nowait((link, depth + 1))
+                except Exception as e:
+                    print(f"Erro ao processar {url}: {e}")
+                finally:
+                    if not summarizing:  # com resumo na fila, quem conclui a página é o summary_worker
+                        finish(url)
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        workers += [asyncio.create_task(summary_worker(summaries, index, store, timer, finish))
+                    for _ in range(summary_workers)]
+        try:
+            await queue.join()
+            await summaries.join()
+        except BaseException:
+            state.save()
+            index.save()
+            print(f"Rastreamento interrompido; estado salvo em {state.path}")
+            raise
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            store.close()
+
+    state.clear()
+    index.save()
+    print(f"{len(state.done)} páginas processadas: {index.stats['changed']} alteradas, "
+          f"{index.stats['unchanged']} sem mudança no conteúdo, {index.stats['not_modified']} não modificadas (304)")
+    timer.report(time.perf_counter() - started)
+
+SUMMARY_SYSTEM_PROMPT = """
 Persona: Você é um assistente técnico especializado em documentação de software.
 Task: Resumir o conteúdo de uma página de documentação técnica.
 Guidelines:
@@ -84,36 +471,172 @@ Output format:
 <Resumo em até 5 frases>
 """
 
+SECTION_SYSTEM_PROMPT = """
+Persona: Você é um assistente técnico especializado em documentação de software.
+Task: Resumir um trecho (uma ou mais seções) de uma página de documentação técnica.
+Guidelines:
+- Seja conciso e mantenha nomes de funções, parâmetros e conceitos importantes.
+- Evite copiar blocos de código.
+Output format:
+<Resumo em até 3 frases>
+"""
+
+def estimate_tokens(text):
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+def split_sections(markdown_text):
+    """Divide o Markdown nos títulos (#, ##, ...), ignorando linhas dentro de blocos de código"""
+    sections, current, in_code = [], [], False
+    for line in markdown_text.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        if not in_code and line.startswith("#") and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return [s for s in sections if s.strip()]
+
+def _split_oversized(text, budget):
+    """Quebra uma seção maior que o orçamento em parágrafos e, se preciso, em cortes fixos"""
+    pieces, current = [], ""
+    for paragraph in text.split("\n\n"):
+        candidate = f"{current}\n\n{paragraph}" if current else paragraph
+        if estimate_tokens(candidate) <= budget:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        if estimate_tokens(paragraph) <= budget:
+            current = paragraph
+        else:
+            step = budget * 4
+            pieces.extend(paragraph[i:i + step] for i in range(0, len(paragraph), step))
+            current = ""
+    if current:
+        pieces.append(current)
+    return pieces
+
+def _pack(parts, budget, separator=""):
+    """Junta partes consecutivas em grupos de até `budget` tokens"""
+    groups, current, current_tokens = [], [], 0
+    for part in parts:
+        tokens = estimate_tokens(part)
+        if current and current_tokens + tokens > budget:
+            groups.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+    if current:
+        groups.append(separator.join(current))
+    return groups
+
+def chunk_markdown(markdown_text, budget=SECTION_TOKEN_BUDGET):
+    """Um bloco por seção; só as seções maiores que `budget` tokens são quebradas.
+
+    Os blocos não juntam seções vizinhas: assim a edição de uma seção não
+    desloca as fronteiras das outras, que continuam acertando o cache.
+    """
+    chunks = []
+    for section in split_sections(markdown_text):
+        chunks.extend([section] if estimate_tokens(section) <= budget else _split_oversized(section, budget))
+    return chunks
+
+async def _summarize(system_prompt, intro, text, max_tokens, semaphore):
     user_prompt = f"""
-A seguir está o conteúdo em Markdown de uma página de documentação técnica:
+{intro}
 
 \"\"\"
-{markdown_text[:50]}
+{text}
 \"\"\"
 
 Gere um resumo do conteúdo:
 """
-
-    try:
-        response = client.chat.completions.create(
+    async with semaphore:
+        response = await achat_completion(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
             temperature=0.3,
-            max_tokens=300
+            max_tokens=max_tokens,
+            cache=get_default_cache()  # resumo de trecho/página inalterado não custa nova chamada
         )
-        return response.choices[0].message.content.strip()
+    return response.strip()
+
+async def asummarize_markdown(markdown_text):
+    """Resume a página inteira em map-reduce.
+
+    Páginas pequenas vão em uma única chamada. Páginas grandes são divididas
+    por títulos, uma seção por bloco (as maiores que SECTION_TOKEN_BUDGET
+    tokens são quebradas), resumidas em paralelo, e os resumos parciais são
+    combinados no resumo final. Como cada chamada passa pelo cache de
+    respostas, só as seções alteradas geram custo.
+    """
+    semaphore = asyncio.Semaphore(SECTION_CONCURRENCY)
+    page_intro = "A seguir está o conteúdo em Markdown de uma página de documentação técnica:"
+    try:
+        if estimate_tokens(markdown_text) <= SINGLE_PASS_TOKENS:
+            return await _summarize(SUMMARY_SYSTEM_PROMPT, page_intro, markdown_text, 300, semaphore)
+
+        chunks = chunk_markdown(markdown_text)
+        summaries = await asyncio.gather(*(
+            _summarize(SECTION_SYSTEM_PROMPT, "A seguir está um trecho de uma página de documentação técnica:",
+                       chunk, 200, semaphore)
+            for chunk in chunks
+        ))
+
+        # Reduz em níveis até os resumos parciais caberem em uma chamada
+        reduce_intro = "A seguir estão resumos das seções de uma página de documentação técnica, em ordem:"
+        while estimate_tokens("\n\n".join(summaries)) > SINGLE_PASS_TOKENS:
+            groups = _pack(summaries, SINGLE_PASS_TOKENS, "\n\n")
+            if len(groups) == len(summaries):
+                break
+            summaries = await asyncio.gather(*(
+                _summarize(SECTION_SYSTEM_PROMPT, reduce_intro, group, 300, semaphore) for group in groups
+            ))
+        return await _summarize(SUMMARY_SYSTEM_PROMPT, reduce_intro, "\n\n".join(summaries), 300, semaphore)
     except Exception as e:
         print(f"Erro ao gerar resumo com LLM: {e}")
         return ""
 
+def summarize_markdown(markdown_text):
+    return run_async(asummarize_markdown(markdown_text))
 
 
 def main():
-    domain = urlparse(BASE_URL).netloc
-    scrape_page(BASE_URL, domain)
+    parser = argparse.ArgumentParser(description="Converte a documentação de um site em Markdown")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH)
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=PER_HOST_CONCURRENCY)
+    parser.add_argument("--delay", type=float, default=PER_HOST_DELAY)
+    parser.add_argument("--no-sitemap", action="store_true", help="não usar sitemap.xml como semente")
+    parser.add_argument("--fresh", action="store_true", help="ignora o checkpoint e começa do zero")
+    parser.add_argument("--summary-workers", type=int, default=SUMMARY_WORKERS)
+    parser.add_argument("--summary-queue", type=int, default=SUMMARY_QUEUE_SIZE)
+    parser.add_argument("--parser", choices=["lxml", "html.parser"], default=PARSER)
+    parser.add_argument("--processes", type=int, default=PARSE_PROCESSES,
+                        help="processos para parse/conversão (0 = no próprio processo)")
+    parser.add_argument("--store", choices=["files", "sharded"], default="files",
+                        help="files: um .md por página em OUTPUT_DIR; sharded: shards comprimidos em --store-dir")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args()
+
+    store = ShardedDocStore(args.store_dir) if args.store == "sharded" else FileStore(OUTPUT_DIR)
+
+    try:
+        run_async(crawl(args.url, args.max_depth, args.max_pages, args.concurrency, args.per_host,
+                          args.delay, use_sitemap=not args.no_sitemap, resume=not args.fresh,
+                          summary_workers=args.summary_workers, summary_queue_size=args.summary_queue,
+                          parser=args.parser, processes=args.processes, store=store))
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
     main()
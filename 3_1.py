@@ -1,8 +1,245 @@
-import openai
+import argparse
+import asyncio
+import csv
+import json
+import os
 import re
-from typing import List, Set
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-client = openai.OpenAI(api_key="")
+from batching import run_batches
+from llm_cache import get_default_cache
+from llm_client import achat_completion, run_async
+
+BATCH_TOKEN_BUDGET = 3000  # tokens de descrições por requisição
+MAX_BATCH_POSTINGS = 25
+MAX_POSTING_TOKENS = 800  # descrições maiores são truncadas
+MAX_CONCURRENCY = 8
+TOP_TECHNOLOGIES = 30
+
+OTHER_CATEGORY = "Outras Tecnologias"
+TECH_CATEGORIES = {  # a ordem das categorias define a prioridade quando um termo casa com mais de uma
+    "Linguagens de Programação": [
+        "python", "javascript", "typescript", "java", "c#", "c++", "go", "golang", "rust", 
+        "php", "ruby", "swift", "kotlin", "scala", "r", "matlab"
+    ],
+    "Frameworks e Bibliotecas": [
+        "react", "vue", "angular", "django", "flask", "spring", "express", 
+        "node.js", "laravel", "rails", "asp.net", "fastapi", "scikit-learn",
+        "pandas", "numpy", "tensorflow", "pytorch"
+    ],
+    "Bancos de Dados": [
+        "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra",
+        "sqlite", "oracle", "sql server", "dynamodb", "firebase"
+    ],
+    "Ferramentas de Desenvolvimento": [
+        "docker", "kubernetes", "git", "jenkins", "gitlab", "github", "webpack",
+        "npm", "yarn", "maven", "gradle", "terraform", "ansible"
+    ],
+    "Cloud e Infraestrutura": [
+        "aws", "azure", "gcp", "heroku", "digitalocean", "prometheus", "grafana",
+        "nginx", "apache", "linux", "ubuntu", "centos"
+    ]
+}
+
+# Tokens de nomes de tecnologia: "c#", "c++" e "node" + "js" (de "node.js") são tokens válidos
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+MEMO_SIZE = 100_000  # termos distintos lembrados pelo TechIndex antes de recomeçar
+LEARNED_TECH_FILE = "./.learned_technologies.json"
+MAX_LEARNED_TOKENS = 4  # respostas mais longas que isso não viram alias
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?;:])\s+|\n+")
+CANDIDATE_PATTERN = re.compile(r"[^\W_][\w+#./-]*[\w+#]")
+NUMERIC_PATTERN = re.compile(r"[\d.,:/-]+")  # salários, anos, datas: nunca são tecnologias
+# Aliases que também são palavras comuns ("go live", "express delivery", "R$"): no texto livre só
+# contam escritos com inicial maiúscula, como palavra isolada e fora do início da frase
+AMBIGUOUS_ALIASES = frozenset({"r", "go", "express", "spring", "swift", "rust", "rails", "yarn"})
+REJECT_AFTER_MISSES = 3  # vezes que a LLM ignora um candidato antes de ele ser descartado
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+class TechIndex:
+    """Taxonomia compilada em um mapa (tokens do alias) -> (prioridade, categoria, nome).
+
+    Termos e aliases passam pela mesma tokenização, e um alias só casa com uma
+    sequência inteira de tokens. Assim "r" e "go" não casam mais dentro de
+    "docker" ou "mongodb", e categorizar um termo custa algumas consultas ao
+    dicionário por token, independente do tamanho da taxonomia.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]] = TECH_CATEGORIES):
+        self.categories = list(taxonomy)
+        self.aliases: Dict[str, Tuple[int, str, str]] = {}  # tokens unidos por espaço -> entrada
+        self.max_tokens = 1
+        self._prefixes: Set[str] = set()  # primeiro token de aliases com mais de um token
+        self._memo: Dict[str, Optional[str]] = {}  # termo -> categoria; a entrada real repete muito
+        for priority, (category, names) in enumerate(taxonomy.items()):
+            for name in names:
+                self.add(name, category, priority)
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def add(self, name: str, category: str = OTHER_CATEGORY, priority: Optional[int] = None):
+        tokens = tokenize(name)
+        if not tokens:
+            return
+        if priority is None:
+            priority = self.categories.index(category) if category in self.categories else len(self.categories)
+        key = " ".join(tokens)
+        current = self.aliases.get(key)
+        if current is None or priority < current[0]:
+            self.aliases[key] = (priority, category, name)
+        if len(tokens) > 1:
+            self._prefixes.add(tokens[0])
+            self.max_tokens = max(self.max_tokens, len(tokens))
+        self._memo.clear()
+
+    def matches(self, tokens: List[str]) -> Iterator[Tuple[int, int, Tuple[int, str, str]]]:
+        """Aliases encontrados em `tokens` como (início, fim, entrada), preferindo o mais longo em cada posição"""
+        aliases = self.aliases
+        i, count = 0, len(tokens)
+        while i < count:
+            entry = None
+            if tokens[i] in self._prefixes:
+                for n in range(min(self.max_tokens, count - i), 1, -1):
+                    entry = aliases.get(" ".join(tokens[i:i + n]))
+                    if entry is not None:
+                        break
+            if entry is None:
+                n = 1
+                entry = aliases.get(tokens[i])
+            if entry is not None:
+                yield i, i + n, entry
+            i += n
+
+    def categorize(self, term: str) -> Optional[str]:
+        category = self._memo.get(term, self)  # self: sentinela de termo ainda não visto
+        if category is not self:
+            return category
+        tokens = tokenize(term)
+        best = self.aliases.get(" ".join(tokens))  # caso comum: o termo é exatamente um alias
+        if best is None:
+            for _, _, entry in self.matches(tokens):
+                if best is None or entry < best:
+                    best = entry
+        category = best[1] if best is not None else None
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[term] = category
+        return category
+
+TECH_INDEX = TechIndex()
+
+class Gazetteer:
+    """Extração local das tecnologias conhecidas antes da LLM.
+
+    scan() devolve as tecnologias do índice encontradas na vaga e só os
+    trechos (frases) com termos candidatos desconhecidos, que são os únicos
+    enviados à LLM. learn() incorpora ao índice os termos que a LLM confirmou
+    e descarta os candidatos que ela ignorou repetidas vezes, então a cada
+    execução sobra menos texto para enviar. O aprendizado fica salvo em `path`.
+    """
+
+    def __init__(self, path: str = LEARNED_TECH_FILE, index: Optional[TechIndex] = None):
+        self.path = path
+        self.index = index or TECH_INDEX
+        self.confirmed: Dict[str, str] = {}  # nome -> categoria
+        self.rejected: Set[str] = set()
+        self.misses: Dict[str, int] = {}  # candidato -> vezes que a LLM não o devolveu
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.confirmed = data.get("confirmed", {})
+        self.rejected = set(data.get("rejected", []))
+        self.misses = data.get("misses", {})
+        for name, category in self.confirmed.items():
+            self.index.add(name, category)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"confirmed": self.confirmed, "rejected": sorted(self.rejected), "misses": self.misses},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def find_known(self, text: str) -> List[str]:
+        """Tecnologias do índice presentes no texto, com a grafia usada na vaga"""
+        lowered = text.lower()
+        source = text if len(lowered) == len(text) else lowered
+        spans = list(TOKEN_PATTERN.finditer(lowered))
+        found = {}
+        tokens = [span.group() for span in spans]
+        for start, end, _ in self.index.matches(tokens):
+            begin, finish = spans[start].start(), spans[end - 1].end()
+            if " ".join(tokens[start:end]) in AMBIGUOUS_ALIASES and not self._looks_like_name(source, begin, finish):
+                continue
+            name = source[begin:finish]
+            found.setdefault(name.lower(), name)
+        return list(found.values())
+
+    @staticmethod
+    def _looks_like_name(text: str, start: int, end: int) -> bool:
+        """Se o alias aparece como nome ("Go", "R", "Swift"): maiúscula, palavra isolada e fora do início da frase"""
+        if not text[start].isupper():
+            return False
+        before, after = text[start - 1:start], text[end:end + 1]
+        if (before and (before.isalnum() or before == "$")) or (after and (after.isalnum() or after in "$&")):
+            return False  # R$, AT&T, ...
+        preceding = text[:start]
+        stripped = preceding.rstrip()
+        return bool(stripped) and stripped[-1] not in ".!?;:" and "\n" not in preceding[len(stripped):]
+
+    def _is_candidate(self, word: str, first: bool) -> bool:
+        if NUMERIC_PATTERN.fullmatch(word) or word.lower() in self.rejected or self.index.categorize(word) is not None:
+            return False
+        if any(c.isupper() or c.isdigit() or c in "+#./-" for c in word[1:]):
+            return True  # GraphQL, RabbitMQ, CI/CD, S3, ...
+        return word[0].isupper() and not first  # nome próprio fora do início da frase
+
+    def scan(self, text: str) -> Tuple[List[str], str, List[str]]:
+        """Retorna (tecnologias conhecidas, trechos para a LLM, candidatos desconhecidos)"""
+        spans, candidates = [], []
+        for sentence in SENTENCE_SPLIT.split(text):
+            words = [word for i, word in enumerate(CANDIDATE_PATTERN.findall(sentence))
+                     if self._is_candidate(word, first=i == 0)]
+            if words:
+                spans.append(sentence.strip())
+                candidates.extend(words)
+        return self.find_known(text), " ".join(spans), candidates
+
+    def _confirm(self, name: str):
+        if self.index.categorize(name) is None and len(tokenize(name)) <= MAX_LEARNED_TOKENS:
+            self.confirmed[name] = OTHER_CATEGORY
+            self.index.add(name, OTHER_CATEGORY)
+
+    def learn(self, candidates: List[str], technologies: List[str]):
+        """Confirma o que a LLM devolveu; um candidato ignorado só é descartado após REJECT_AFTER_MISSES vagas.
+
+        Cada vaga conta no máximo uma falta por candidato, por mais que o termo se repita nela.
+        """
+        returned_tokens = {token for tech in technologies for token in tokenize(tech)}
+        for tech in technologies:
+            self._confirm(tech)
+        unique = {}
+        for word in candidates:
+            unique.setdefault(word.lower(), word)
+        for key, word in unique.items():
+            if set(tokenize(word)) & returned_tokens:
+                self._confirm(word)  # "Spark" de "Apache Spark" passa a ser conhecido sozinho
+                self.misses.pop(key, None)
+                continue
+            self.misses[key] = self.misses.get(key, 0) + 1
+            if self.misses[key] >= REJECT_AFTER_MISSES:
+                self.rejected.add(key)
+                del self.misses[key]
 
 sample_job_descriptions = [
     """
@@ -34,13 +271,7 @@ sample_job_descriptions = [
     """
 ]
 
-def extract_technologies_with_ner(job_descriptions: List[str]) -> Set[str]:
-    """
-    Usa NER para extrair tecnologias das descrições de vagas
-    """
-    combined_descriptions = "\n\n".join(job_descriptions)
-    
-    system_prompt = """
+system_prompt = """
 Persona: Você é um especialista em análise de vagas de tecnologia com conhecimento profundo em programação, frameworks e ferramentas.
 Task: Identificar todas as tecnologias mencionadas em descrições de vagas usando Named Entity Recognition (NER).
 Guidelines:
@@ -51,92 +282,243 @@ Guidelines:
 - Identifique plataformas cloud (AWS, Azure, GCP, etc.)
 - Retorne apenas nomes de tecnologias, sem descrições adicionais
 Output format:
-Uma lista simples de tecnologias únicas, uma por linha, sem numeração ou formatação especial.
+Um objeto JSON no formato {"postings": [{"id": <id da vaga>, "technologies": ["<tecnologia>", ...]}]}
+- Exatamente um item por vaga recebida, usando o mesmo id.
 """
 
-    user_prompt = f"""
-Analise as seguintes descrições de vagas e extraia todas as tecnologias mencionadas:
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1  # aproximação de ~4 caracteres por token
 
-\"\"\"
-{combined_descriptions}
-\"\"\"
+def truncate_posting(text: str, max_tokens: int = MAX_POSTING_TOKENS) -> str:
+    text = " ".join(text.split())
+    return text[:max_tokens * 4]
 
-Liste todas as tecnologias únicas identificadas:
-"""
+def iter_postings(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """Lê vagas sob demanda de um arquivo JSONL, CSV ou texto (uma por linha), gerando (id, descrição)"""
+    fmt = fmt or path.rsplit(".", 1)[-1].lower()
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        temperature=0.1,
-        max_tokens=1000
-    )
-
-    technologies_text = response.choices[0].message.content.strip()
-    technologies = set()
-    
-    for line in technologies_text.split('\n'):
-        tech = line.strip().strip('-').strip('*').strip()
-        if tech and len(tech) > 1: 
-            technologies.add(tech)
-    
-    return technologies
+    if fmt in ("jsonl", "ndjson", "json"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if line.strip():
+                    record = json.loads(line)
+                    text = record.get("description") or record.get("text") or ""
+                    if record.get("title"):
+                        text = f"{record['title']}\n{text}"
+                    yield str(record.get("id", line_number)), text
+    elif fmt == "csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f)):
+                text = row.get("description") or row.get("text") or ""
+                if row.get("title"):
+                    text = f"{row['title']}\n{text}"
+                yield str(row.get("id") or row_number), text
+    elif fmt == "txt":
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if line.strip():
+                    yield str(line_number), line
+    else:
+        raise ValueError(f"Formato de entrada não suportado: {fmt}")
+
+def token_batches(postings: Iterable[Tuple[str, str]], budget: int = BATCH_TOKEN_BUDGET,
+                  max_postings: int = MAX_BATCH_POSTINGS) -> Iterator[List[Tuple[str, str]]]:
+    """Agrupa vagas em lotes que cabem em `budget` tokens, sem materializar a entrada"""
+    batch, used = [], 0
+    for posting_id, text in postings:
+        text = truncate_posting(text)
+        tokens = estimate_tokens(text)
+        if batch and (used + tokens > budget or len(batch) >= max_postings):
+            yield batch
+            batch, used = [], 0
+        batch.append((posting_id, text))
+        used += tokens
+    if batch:
+        yield batch
 
-def categorize_technologies(technologies: Set[str]) -> dict:
+def clean_technology(name) -> Optional[str]:
+    tech = str(name).strip().strip('-').strip('*').strip()
+    return tech if len(tech) > 1 else None
+
+async def extract_batch(batch: List[Tuple[str, str]],
+                        slots: Optional[asyncio.Semaphore] = None) -> List[Tuple[str, Optional[List[str]]]]:
+    """Extrai as tecnologias de várias vagas em uma única requisição com saída JSON por vaga.
+
+    Vagas ausentes ou inválidas na resposta (e o lote inteiro, se a chamada
+    falhar) são refeitas sozinhas, em paralelo. Uma vaga cuja resposta não
+    pôde ser lida volta com None, para não ser confundida com uma vaga sem
+    tecnologias. Cada requisição, do lote ou de uma vaga refeita, ocupa uma
+    vaga de `slots`, compartilhado entre os lotes do extract_stream.
+    """
+    slots = slots or asyncio.Semaphore(MAX_CONCURRENCY)
+    payload = [{"id": i, "vaga": text} for i, (_, text) in enumerate(batch)]
+    found = {}
+    try:
+        async with slots:
+            response = await achat_completion(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Vagas:\n" + json.dumps(payload, ensure_ascii=False)}
+                ],
+                temperature=0.1,
+                max_tokens=min(16000, 100 + 200 * len(batch)),  # vagas longas listam dezenas de tecnologias
+                response_format={"type": "json_object"},
+                cache=get_default_cache()
+            )
+        for item in json.loads(response).get("postings", []):
+            found[int(item["id"])] = [t for t in map(clean_technology, item.get("technologies", [])) if t]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        pass
+    except Exception as e:
+        if len(batch) == 1:
+            raise
+        print(f"Erro ao extrair lote de {len(batch)} vagas, refazendo uma a uma: {e}", file=sys.stderr)
+
+    missing = [i for i in range(len(batch)) if i not in found]
+    if len(batch) > 1 and missing:
+        retries = await asyncio.gather(*(extract_batch([batch[i]], slots) for i in missing),
+                                       return_exceptions=True)
+        for i, retry in zip(missing, retries):
+            if isinstance(retry, Exception):
+                print(f"Erro ao extrair a vaga {batch[i][0]}: {retry}", file=sys.stderr)
+            else:
+                found[i] = retry[0][1]
+    return [(posting_id, found.get(i)) for i, (posting_id, _) in enumerate(batch)]
+
+async def extract_stream(postings: Iterable[Tuple[str, str]], output=None, concurrency: int = MAX_CONCURRENCY,
+                         budget: int = BATCH_TOKEN_BUDGET, report_every: float = 5.0,
+                         gazetteer: Optional[Gazetteer] = None) -> Counter:
+    """Extrai tecnologias de um fluxo de vagas e conta em quantas vagas cada uma aparece.
+
+    No máximo `concurrency` lotes (e `concurrency` requisições, contando as
+    vagas refeitas sozinhas) ficam em voo e os resultados por vaga são
+    escritos em JSONL conforme ficam prontos, então a memória depende só do
+    vocabulário de tecnologias, não do tamanho da entrada. Com `gazetteer`,
+    as tecnologias conhecidas são extraídas localmente e só os trechos com
+    termos desconhecidos vão para a LLM.
+    """
+    start = time.perf_counter()
+    slots = asyncio.Semaphore(concurrency)
+    total = 0
+    counts: Counter = Counter()
+    names: Dict[str, str] = {}  # nome normalizado -> primeira grafia vista
+    in_flight: Dict[int, Tuple[str, List[str], List[str]]] = {}  # sequência -> (id, conhecidas, candidatos)
+    stats = {"local": 0, "tokens_full": 0, "tokens_sent": 0}
+
+    def record(posting_id, technologies):
+        nonlocal total
+        unique = {}
+        for tech in technologies:
+            unique.setdefault(tech.lower(), tech)
+        for key, tech in unique.items():
+            names.setdefault(key, tech)
+            counts[key] += 1
+        if output is not None:
+            output.write(json.dumps({"id": posting_id, "technologies": list(unique.values())},
+                                    ensure_ascii=False) + "\n")
+        total += 1
+
+    def merge_results(batch, results, error):
+        if error is not None:
+            print(f"Erro ao extrair lote: {error}", file=sys.stderr)
+            results = [(sequence, None) for sequence, _ in batch]  # mantém só as conhecidas
+        for sequence, technologies in results:
+            posting_id, known, candidates = in_flight.pop(sequence)
+            if technologies is None:
+                technologies = []
+            elif gazetteer is not None:
+                gazetteer.learn(candidates, technologies)
+            record(posting_id, known + technologies)
+        if output is not None:
+            output.flush()
+
+    def report(elapsed):
+        print(f"{total} vagas processadas ({total / elapsed:.1f} vagas/s)", file=sys.stderr)
+
+    def llm_postings():
+        for sequence, (posting_id, text) in enumerate(postings):
+            stats["tokens_full"] += estimate_tokens(truncate_posting(text))
+            known, candidates = [], []
+            if gazetteer is not None:
+                known, text, candidates = gazetteer.scan(text)
+                if not text:  # só tecnologias conhecidas: nenhuma chamada à LLM
+                    stats["local"] += 1
+                    record(posting_id, known)
+                    continue
+            stats["tokens_sent"] += estimate_tokens(truncate_posting(text))
+            in_flight[sequence] = (posting_id, known, candidates)
+            yield sequence, text
+
+    await run_batches(token_batches(llm_postings(), budget), lambda batch: extract_batch(batch, slots),
+                      merge_results, concurrency, report, report_every)
+
+    elapsed = time.perf_counter() - start
+    print(f"Total: {total} vagas em {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} vagas/s)",
+          file=sys.stderr)
+    if gazetteer is not None:
+        gazetteer.save()
+        print(f"{stats['local']} vagas resolvidas só com o dicionário; ~{stats['tokens_sent']} de "
+              f"~{stats['tokens_full']} tokens de descrição enviados à LLM", file=sys.stderr)
+    return Counter({names[key]: count for key, count in counts.items()})
+
+def extract_technologies_with_ner(job_descriptions: List[str]) -> Set[str]:
+    """
+    Usa NER para extrair tecnologias das descrições de vagas
+    """
+    postings = ((str(i), text) for i, text in enumerate(job_descriptions))
+    return set(run_async(extract_stream(postings, gazetteer=Gazetteer())))
+
+def categorize_technologies(technologies: Set[str], index: Optional[TechIndex] = None) -> dict:
     """
     Categoriza as tecnologias por tipo
     """
-    categories = {
-        "Linguagens de Programação": [],
-        "Frameworks e Bibliotecas": [],
-        "Bancos de Dados": [],
-        "Ferramentas de Desenvolvimento": [],
-        "Cloud e Infraestrutura": [],
-        "Outras Tecnologias": []
-    }
-    
-    tech_categories = {
-        "Linguagens de Programação": [
-            "python", "javascript", "typescript", "java", "c#", "c++", "go", "rust", 
-            "php", "ruby", "swift", "kotlin", "scala", "r", "matlab"
-        ],
-        "Frameworks e Bibliotecas": [
-            "react", "vue", "angular", "django", "flask", "spring", "express", 
-            "node.js", "laravel", "rails", "asp.net", "fastapi", "scikit-learn",
-            "pandas", "numpy", "tensorflow", "pytorch"
-        ],
-        "Bancos de Dados": [
-            "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra",
-            "sqlite", "oracle", "sql server", "dynamodb", "firebase"
-        ],
-        "Ferramentas de Desenvolvimento": [
-            "docker", "kubernetes", "git", "jenkins", "gitlab", "github", "webpack",
-            "npm", "yarn", "maven", "gradle", "terraform", "ansible"
-        ],
-        "Cloud e Infraestrutura": [
-            "aws", "azure", "gcp", "heroku", "digitalocean", "prometheus", "grafana",
-            "nginx", "apache", "linux", "ubuntu", "centos"
-        ]
-    }
-    
+    index = index or TECH_INDEX
+    categories = {category: [] for category in index.categories}
+    categories[OTHER_CATEGORY] = []
+
     for tech in technologies:
-        tech_lower = tech.lower()
-        categorized = False
-        
-        for category, tech_list in tech_categories.items():
-            if any(tech_name in tech_lower for tech_name in tech_list):
-                categories[category].append(tech)
-                categorized = True
-                break
-        
-        if not categorized:
-            categories["Outras Tecnologias"].append(tech)
+        categories.setdefault(index.categorize(tech) or OTHER_CATEGORY, []).append(tech)
     
     return categories
 
+def print_categories(categories: dict, counts: Optional[Counter] = None):
+    for category, techs in categories.items():
+        if techs:
+            print(f"\n{category}:")
+            for tech in sorted(techs):
+                print(f"  • {tech}" + (f" ({counts[tech]})" if counts else ""))
+
 def main():
+    parser = argparse.ArgumentParser(description="Extrai e categoriza tecnologias de descrições de vagas")
+    parser.add_argument("--input", metavar="ARQUIVO", help="arquivo de vagas JSONL, CSV ou texto (uma por linha)")
+    parser.add_argument("--format", choices=["jsonl", "csv", "txt"], help="formato da entrada (padrão: extensão)")
+    parser.add_argument("--output", help="arquivo JSONL com as tecnologias de cada vaga")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--batch-tokens", type=int, default=BATCH_TOKEN_BUDGET)
+    parser.add_argument("--top", type=int, default=TOP_TECHNOLOGIES)
+    parser.add_argument("--no-gazetteer", action="store_true",
+                        help="envia as vagas inteiras à LLM, sem a extração local das tecnologias conhecidas")
+    args = parser.parse_args()
+
+    if args.input:
+        output = open(args.output, "w", encoding="utf-8") if args.output else None
+        try:
+            gazetteer = None if args.no_gazetteer else Gazetteer()
+            counts = run_async(extract_stream(iter_postings(args.input, args.format), output,
+                                                args.concurrency, args.batch_tokens, gazetteer=gazetteer))
+        finally:
+            if output is not None:
+                output.close()
+
+        print(f"Total de tecnologias únicas identificadas: {len(counts)}")
+        print("\nTecnologias mais frequentes:")
+        for tech, count in counts.most_common(args.top):
+            print(f"* {tech}: {count} vaga(s)")
+        top = dict(counts.most_common(args.top))
+        print("\n Tecnologias por categoria:")
+        print_categories(categorize_technologies(set(top)), counts)
+        return
     
     technologies = extract_technologies_with_ner(sample_job_descriptions)
     
@@ -149,12 +531,7 @@ def main():
     categories = categorize_technologies(technologies)
     
     print("\n Tecnologias por categoria:")
-    
-    for category, techs in categories.items():
-        if techs:
-            print(f"\n{category}:")
-            for tech in sorted(techs):
-                print(f"  • {tech}")
+    print_categories(categories)
 
 if __name__ == "__main__":
     main()
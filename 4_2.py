@@ -1,8 +1,14 @@
 import streamlit as st
-import openai
 from streamlit_audio_recorder import audio_recorder
 import tempfile
 
+import openai
+
+from llm_client import get_client
+
+# Uploads de áudio longos passam fácil do timeout de 60s do pool compartilhado; usa o padrão do SDK (600s)
+TRANSCRIPTION_TIMEOUT = openai.DEFAULT_TIMEOUT
+
 st.set_page_config(page_title="Transcrição de Áudio com IA")
 
 st.title("Transcrição de Áudio com IA")
@@ -17,16 +23,16 @@ audio_file = st.file_uploader("Faça upload de um arquivo de áudio (WAV, MP3, M
 # recorded_audio = audio_recorder(text="Clique para gravar", pause_threshold=2.0, sample_rate=16000)
 
 def transcrever_audio(audio_bytes, api_key):
-    openai.api_key = api_key
     with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmpfile:
         tmpfile.write(audio_bytes)
         tmpfile.flush()
         tmpfile.seek(0)
         audio = open(tmpfile.name, "rb")
-        transcript = openai.audio.transcriptions.create(
+        transcript = get_client(api_key).audio.transcriptions.create(
             model="whisper-1",
             file=audio,
-            response_format="text"
+            response_format="text",
+            timeout=TRANSCRIPTION_TIMEOUT
         )
         return transcript
 
@@ -1,20 +1,38 @@
 import streamlit as st
-import openai
+import hashlib
 import os
-import tempfile
-from typing import List, Dict, Optional
+from itertools import groupby
+from typing import Iterable, List, Dict, Optional, Tuple
 import json
 import time
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.document_loaders import PyPDFLoader
-from langchain.embeddings import OpenAIEmbeddings
 from langchain.vectorstores import Chroma
 from langchain.chains import RetrievalQA
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import Document
 from langchain.prompts import PromptTemplate
 
+from batched_embeddings import MAX_BATCH_INPUTS, BatchedEmbeddings, estimate_tokens
+from bm25_index import BM25Index, lexical_margin, reciprocal_rank_fusion
+from llm_client import get_http_client
+from pdf_parsing import PdfPage, iter_pdf_pages
+from vector_index import MmapVectorStore
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")  # "chroma" ou "mmap" (índice nativo do vector_index.py)
+INDEX_DIR = "./vector_index" if VECTOR_BACKEND == "mmap" else "./chroma_db"
+MANIFEST_FILE = os.path.join(INDEX_DIR, "manifest.json")
+BM25_FILE = os.path.join(INDEX_DIR, "bm25.sqlite")
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+EMBEDDING_CONCURRENCY = 4
+PARSE_PROCESSES = os.cpu_count() or 1
+SEARCH_K = 5
+HYBRID_CANDIDATES = 20  # resultados de cada busca (BM25 e vetorial) que entram na fusão
+LEXICAL_MIN_COVERAGE = 0.99  # o melhor trecho do BM25 precisa conter todos os termos da pergunta,
+LEXICAL_MIN_MARGIN = 0.3  # se destacar do segundo
+LEXICAL_MIN_SCORE = 10.0  # e ter pontuação alta, ou vir com ao menos k resultados, para dispensar a busca vetorial
+
 st.set_page_config(
     page_title="Chatbot de Documentos da Empresa",
     layout="wide"
@@ -27,70 +45,256 @@ if 'documents_loaded' not in st.session_state:
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 
+def chunk_ids(chunks: List[Document]) -> List[str]:
+    """Id estável de cada chunk: hash de arquivo de origem, página, texto e ocorrência.
+
+    A ocorrência diferencia textos repetidos na mesma página, então o mesmo
+    conteúdo sempre gera os mesmos ids e só chunks novos ou alterados
+    precisam de embedding.
+    """
+    seen = {}
+    ids = []
+    for chunk in chunks:
+        key = (str(chunk.metadata.get("source", "")), str(chunk.metadata.get("page", "")), chunk.page_content)
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        ids.append(hashlib.sha256("\x00".join(key + (str(occurrence),)).encode("utf-8")).hexdigest()[:32])
+    return ids
+
+class IngestManifest:
+    """Hash de cada PDF já indexado e os ids dos seus chunks no índice vetorial"""
+
+    def __init__(self, path: str = MANIFEST_FILE):
+        self.path = path
+        self.files: Dict[str, Dict] = {}  # nome do arquivo -> {"hash": ..., "chunks": [...]}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f)
+        os.replace(tmp_path, self.path)
+
 class CompanyDocumentChatbot:
     
     def __init__(self, api_key: str):
         self.api_key = api_key
-        openai.api_key = api_key
-        self.embeddings = OpenAIEmbeddings(openai_api_key=api_key)
+        self.embeddings = BatchedEmbeddings(api_key=api_key, concurrency=EMBEDDING_CONCURRENCY)
         self.llm = ChatOpenAI(
             openai_api_key=api_key,
             model_name="gpt-4o-mini",
-            temperature=0.1
+            temperature=0.1,
+            http_client=get_http_client()
         )
         self.vectorstore = None
+        self.bm25 = None
         self.qa_chain = None
     
+    def _add_chunks(self, batch: List) -> int:
+        ids = [chunk_id for chunk_id, _ in batch]
+        chunks = [chunk for _, chunk in batch]
+        self.vectorstore.add_documents(chunks, ids=ids)
+        self.bm25.add(ids, chunks)
+        return len(batch)
+    
+    def _delete_chunks(self, ids: List[str]):
+        self.vectorstore.delete(ids=ids)
+        self.bm25.delete(ids)
+    
+    def _open_indexes(self):
+        if self.vectorstore is None:
+            if VECTOR_BACKEND == "mmap":
+                self.vectorstore = MmapVectorStore(INDEX_DIR, self.embeddings)
+            else:
+                self.vectorstore = Chroma(persist_directory=INDEX_DIR, embedding_function=self.embeddings)
+        if self.bm25 is None:
+            self.bm25 = BM25Index(BM25_FILE)
+    
+    def _index_file(self, manifest: IngestManifest, name: str, file_hash: str, pages: Iterable[PdfPage],
+                    text_splitter: RecursiveCharacterTextSplitter, stats: Dict, pending: Dict):
+        """Chunka as páginas conforme chegam e acumula em `pending` só os chunks que ainda não estão no índice"""
+        entry = manifest.files.get(name)
+        old_ids = set(entry["chunks"]) if entry else set()
+        lexical_missing = self.bm25.missing(old_ids)  # chunks embedados antes de existir o BM25
+        ids, lexical = [], []
+        
+        for page in pages:
+            stats["pages"] += 1
+            chunks = text_splitter.split_documents(
+                [Document(page_content=page.text, metadata={"source": name, "page": page.page})]
+            )
+            for chunk_id, chunk in zip(chunk_ids(chunks), chunks):
+                ids.append(chunk_id)
+                if chunk_id not in old_ids:
+                    pending["chunks"].append((chunk_id, chunk))
+                    pending["tokens"] += estimate_tokens(chunk.page_content)
+                elif chunk_id in lexical_missing:
+                    lexical.append((chunk_id, chunk))
+            self._flush(manifest, pending, stats)
+        if lexical:
+            self.bm25.add([chunk_id for chunk_id, _ in lexical], [chunk for _, chunk in lexical])
+        
+        removed = old_ids - set(ids)
+        stats["kept"] += len(old_ids) - len(removed)
+        stats["removed"] += len(removed)
+        pending["files"].append((name, file_hash, ids, list(removed)))
+        self._flush(manifest, pending, stats)
+    
+    def _flush(self, manifest: IngestManifest, pending: Dict, stats: Dict, force: bool = False):
+        """Embeda os chunks acumulados quando eles enchem todas as requisições paralelas dos embeddings.
+
+        Chunks de vários arquivos pequenos vão juntos, então cada chamada a
+        add_documents tem lotes para as `concurrency` threads. Um arquivo só
+        entra no manifesto (e perde os chunks antigos) depois que os seus
+        chunks novos estão no índice, então um erro no meio não o marca como
+        concluído.
+        """
+        full = (pending["tokens"] >= self.embeddings.concurrency * self.embeddings.max_batch_tokens
+                or len(pending["chunks"]) >= self.embeddings.concurrency * MAX_BATCH_INPUTS)
+        if not (full or force):
+            return
+        if pending["chunks"]:
+            stats["added"] += self._add_chunks(pending["chunks"])
+        for name, file_hash, ids, removed in pending["files"]:
+            if removed:
+                self._delete_chunks(removed)
+            manifest.files[name] = {"hash": file_hash, "chunks": ids}
+        if pending["files"]:
+            manifest.save()  # um erro no meio do lote não refaz os arquivos já concluídos
+        pending.update(chunks=[], tokens=0, files=[])
+    
     def load_pdf_documents(self, pdf_files: List) -> bool:
+        """Indexa os PDFs de forma incremental no índice persistente em INDEX_DIR.
+
+        PDFs com o mesmo hash da última ingestão são pulados; nos alterados só
+        os chunks novos são embedados e os que sumiram são apagados. PDFs já
+        indexados que não estão neste envio continuam no índice; para tirá-los
+        use remove_documents(). O índice BM25 em BM25_FILE acompanha as mesmas
+        inclusões e remoções.
+        """
         try:
-            documents = []
-            
-            for pdf_file in pdf_files:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    tmp_file.write(pdf_file.read())
-                    tmp_file.flush()
-                    
-                    loader = PyPDFLoader(tmp_file.name)
-                    pdf_documents = loader.load()
-                    documents.extend(pdf_documents)
-                    
-                    os.unlink(tmp_file.name)
-            
-            if not documents:
-                st.error("Nenhum documento foi carregado")
-                return False
-            
+            self.embeddings.reset_stats()
+            manifest = IngestManifest()
+            self._open_indexes()
             text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
+                chunk_size=CHUNK_SIZE,
+                chunk_overlap=CHUNK_OVERLAP,
                 length_function=len,
             )
+            stats = {"unchanged_files": 0, "pages": 0, "added": 0, "kept": 0, "removed": 0}
+            uploaded = set()
+            to_parse = []  # (nome, bytes) dos PDFs novos ou alterados
+            hashes = {}
             
-            chunks = text_splitter.split_documents(documents)
+            for pdf_file in pdf_files:
+                data = pdf_file.getvalue() if hasattr(pdf_file, "getvalue") else pdf_file.read()
+                name = pdf_file.name
+                if name in uploaded:
+                    continue  # o manifesto é por nome de arquivo
+                uploaded.add(name)
+                file_hash = hashlib.sha256(data).hexdigest()
+                entry = manifest.files.get(name)
+                if entry and entry["hash"] == file_hash and not self.bm25.missing(entry["chunks"]):
+                    stats["unchanged_files"] += 1
+                    stats["kept"] += len(entry["chunks"])
+                    continue
+                
+                hashes[name] = file_hash
+                to_parse.append((name, data))
             
-            self.vectorstore = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory="./chroma_db"
-            )
+            # os PDFs são lidos da memória em paralelo e as páginas chegam em ordem, arquivo a arquivo
+            pending = {"chunks": [], "tokens": 0, "files": []}
+            pages = iter_pdf_pages(to_parse, processes=PARSE_PROCESSES)
+            for name, file_pages in groupby(pages, key=lambda page: page.source):
+                self._index_file(manifest, name, hashes.pop(name), file_pages, text_splitter, stats, pending)
+            for name, file_hash in hashes.items():  # PDFs sem nenhuma página
+                self._index_file(manifest, name, file_hash, [], text_splitter, stats, pending)
+            self._flush(manifest, pending, stats, force=True)
+            
+            manifest.save()
+            self.vectorstore.persist()
+            
+            if not manifest.files:
+                st.error("Nenhum documento foi carregado")
+                return False
             
             self.qa_chain = RetrievalQA.from_chain_type(
                 llm=self.llm,
                 chain_type="stuff",
                 retriever=self.vectorstore.as_retriever(
                     search_type="similarity",
-                    search_kwargs={"k": 5}
+                    search_kwargs={"k": SEARCH_K}
                 ),
                 return_source_documents=True
             )
             
-            st.success(f"{len(documents)} documentos carregados com sucesso!")
+            st.success(
+                f"{len(pdf_files)} documentos carregados com sucesso! "
+                f"{stats['unchanged_files']} sem alterações, {stats['pages']} páginas processadas, "
+                f"{stats['added']} trechos novos, {stats['kept']} reaproveitados e {stats['removed']} removidos."
+            )
+            embedding_stats = self.embeddings.stats
+            if embedding_stats["chunks"]:
+                st.info(
+                    f"Embeddings: {embedding_stats['chunks']} trechos ({embedding_stats['cached']} do cache) "
+                    f"em {embedding_stats['batches']} lotes, {self.embeddings.throughput():.1f} trechos/s"
+                )
             return True
             
         except Exception as e:
             st.error(f"Erro ao carregar documentos: {e}")
             return False
     
+    def retrieve(self, question: str, k: int = SEARCH_K) -> Tuple[List[Document], Dict]:
+        """Trechos para a pergunta e o tempo de cada etapa da busca, em ms.
+
+        Quando a pergunta é um casamento exato (códigos de política, nomes,
+        números), a busca termina no caminho léxico, sem chamar a API de
+        embeddings: o melhor resultado do BM25 precisa conter todos os termos
+        da pergunta, inclusive os que não aparecem em nenhum documento, se
+        destacar do segundo e vir com ao menos `k` resultados ou pontuação
+        alta. Caso contrário, os resultados do BM25 e da busca vetorial são
+        fundidos por reciprocal rank fusion.
+        """
+        start = time.perf_counter()
+        hits = self.bm25.search(question, HYBRID_CANDIDATES)
+        timings = {"lexical_ms": (time.perf_counter() - start) * 1e3}
+        confident = (
+            hits
+            and hits[0].coverage >= LEXICAL_MIN_COVERAGE
+            and lexical_margin(hits) >= LEXICAL_MIN_MARGIN
+            and (len(hits) >= k or hits[0].score >= LEXICAL_MIN_SCORE)
+        )
+        if confident:
+            documents = self.bm25.documents([hit.id for hit in hits[:k]])
+            timings.update(path="lexical", retrieval_ms=(time.perf_counter() - start) * 1e3)
+            return documents, timings
+        
+        step = time.perf_counter()
+        query_vector = self.embeddings.embed_query(question)
+        timings["embedding_ms"] = (time.perf_counter() - step) * 1e3
+        step = time.perf_counter()
+        vector_documents = self.vectorstore.similarity_search_by_vector(query_vector, k=HYBRID_CANDIDATES)
+        timings["vector_ms"] = (time.perf_counter() - step) * 1e3
+        
+        step = time.perf_counter()
+        by_key = {}
+        rankings = []
+        for ranking in (self.bm25.documents([hit.id for hit in hits]), vector_documents):
+            keys = []
+            for doc in ranking:
+                key = (str(doc.metadata.get("source", "")), str(doc.metadata.get("page", "")), doc.page_content)
+                by_key.setdefault(key, doc)
+                keys.append(key)
+            rankings.append(keys)
+        documents = [by_key[key] for key in reciprocal_rank_fusion(rankings)[:k]]
+        timings["fusion_ms"] = (time.perf_counter() - step) * 1e3
+        timings.update(path="hybrid", retrieval_ms=(time.perf_counter() - start) * 1e3)
+        return documents, timings
+    
     def answer_question(self, question: str) -> Dict:
         if not self.qa_chain:
             return {
@@ -100,10 +304,10 @@ class CompanyDocumentChatbot:
             }
         
         try:
-            result = self.qa_chain({"query": question})
-            
-            answer = result["result"]
-            source_documents = result["source_documents"]
+            source_documents, timings = self.retrieve(question)
+            start = time.perf_counter()
+            answer = self.qa_chain.combine_documents_chain.run(input_documents=source_documents, question=question)
+            timings["llm_ms"] = (time.perf_counter() - start) * 1e3
             
             sources = []
             for doc in source_documents:
@@ -117,7 +321,8 @@ class CompanyDocumentChatbot:
             return {
                 "answer": answer,
                 "sources": sources,
-                "confidence": self._calculate_confidence(answer, sources)
+                "confidence": self._calculate_confidence(answer, sources),
+                "retrieval": timings
             }
             
         except Exception as e:
@@ -144,6 +349,22 @@ class CompanyDocumentChatbot:
         
         return min(confidence, 1.0)
     
+    def remove_documents(self, names: Iterable[str]) -> int:
+        """Apaga do índice vetorial e do BM25 os trechos dos PDFs indicados; retorna quantos saíram"""
+        manifest = IngestManifest()
+        self._open_indexes()
+        removed = 0
+        for name in names:
+            entry = manifest.files.pop(name, None)
+            if entry and entry["chunks"]:
+                self._delete_chunks(entry["chunks"])
+                removed += len(entry["chunks"])
+        manifest.save()
+        self.vectorstore.persist()
+        if not manifest.files:
+            self.qa_chain = None
+        return removed
+    
     def get_document_summary(self) -> Dict:
         if not self.vectorstore:
             return {"total_documents": 0, "topics": []}
@@ -190,6 +411,11 @@ def display_chat_interface():
                 
                 if "sources" in message and message["sources"]:
                     with st.expander("Ver fontes"):
+                        retrieval = message.get("retrieval")
+                        if retrieval:
+                            path = "léxica (BM25, sem embedding)" if retrieval["path"] == "lexical" else "híbrida"
+                            st.caption(f"Busca {path} em {retrieval['retrieval_ms']:.0f} ms; "
+                                       f"resposta do modelo em {retrieval['llm_ms']:.0f} ms")
                         for i, source in enumerate(message["sources"][:3]):
                             st.markdown(f"**Fonte {i+1}:**")
                             st.markdown(f"Página: {source['page']}")
@@ -222,6 +448,7 @@ def display_chat_interface():
                         "content": result["answer"],
                         "sources": result["sources"],
                         "confidence": result["confidence"],
+                        "retrieval": result.get("retrieval", {}),
                         "timestamp": time.time()
                     })
                     
@@ -281,6 +508,22 @@ def display_document_upload():
                         st.write("**Tópicos identificados:**")
                         for topic in summary["topics"]:
                             st.write(f"• {topic}")
+    
+    indexed = sorted(IngestManifest().files)
+    if indexed:
+        st.write("**Documentos no índice:**")
+        to_remove = st.multiselect("Remover do índice:", indexed,
+                                   help="Documentos fora do envio atual continuam no índice até serem removidos aqui.")
+        if to_remove and st.button("Remover Documentos"):
+            api_key = st.session_state.get('openai_api_key')
+            if not api_key:
+                st.error("Configure a chave da API OpenAI primeiro!")
+                return
+            chatbot = st.session_state.get('chatbot') or CompanyDocumentChatbot(api_key)
+            removed = chatbot.remove_documents(to_remove)
+            st.success(f"{len(to_remove)} documento(s) removido(s) ({removed} trechos).")
+            if chatbot.qa_chain is None:
+                st.session_state.documents_loaded = False
 
 def display_settings():
     st.sidebar.subheader("Configurações")
@@ -359,6 +602,25 @@ def display_analytics():
             avg_confidence = sum(confidences) / len(confidences)
         st.metric("Confiança Média", f"{avg_confidence:.1%}")
     
+    retrievals = [m["retrieval"] for m in st.session_state.chat_history
+                  if m["role"] == "assistant" and m.get("retrieval")]
+    if retrievals:
+        st.write("**Latência por caminho de busca:**")
+        
+        def average(runs, key):
+            return sum(run.get(key, 0.0) for run in runs) / len(runs)
+        
+        for path, label in (("lexical", "Léxico (BM25, sem embedding)"), ("hybrid", "Híbrido (BM25 + vetorial)")):
+            runs = [r for r in retrievals if r["path"] == path]
+            if not runs:
+                continue
+            details = f"BM25 {average(runs, 'lexical_ms'):.1f} ms"
+            if path == "hybrid":
+                details += (f", embedding {average(runs, 'embedding_ms'):.0f} ms, vetorial {average(runs, 'vector_ms'):.1f} ms, "
+                            f"fusão {average(runs, 'fusion_ms'):.1f} ms")
+            st.write(f"• {label}: {len(runs)} perguntas, busca {average(runs, 'retrieval_ms'):.1f} ms ({details}), "
+                     f"modelo {average(runs, 'llm_ms'):.0f} ms")
+    
     if st.session_state.chat_history:
         st.write("**Perguntas recentes:**")
         recent_questions = [m["content"] for m in st.session_state.chat_history[-5:] if m["role"] == "user"]
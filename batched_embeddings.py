@@ -0,0 +1,238 @@
+import argparse
+import array
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langchain.embeddings.base import Embeddings
+
+from llm_client import get_client
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # sem tiktoken, estimamos ~4 caracteres por token
+    _encoding = None
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"  # o mesmo padrão do OpenAIEmbeddings, mantendo os vetores compatíveis
+DEFAULT_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./.embedding_cache.sqlite")
+MAX_BATCH_TOKENS = 50_000  # tokens por requisição
+MAX_BATCH_INPUTS = 512  # textos por requisição (a API aceita até 2048)
+DEFAULT_CONCURRENCY = 4
+REQUESTS_PER_MINUTE = 3000
+TOKENS_PER_MINUTE = 1_000_000
+
+
+def estimate_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Vetores já calculados em SQLite, endereçados por (modelo, hash do texto)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )"""
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), 500):  # limite de parâmetros do SQLite
+                chunk = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN "
+                    f"({','.join('?' * len(chunk))})",
+                    [model, *chunk]
+                )
+                for key, blob in rows:
+                    vector = array.array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+        return found
+
+    def put_many(self, model: str, items: List[Tuple[str, List[float]]]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [(model, key, array.array("f", vector).tobytes(), now) for key, vector in items]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """Limite de requisições e tokens por minuto compartilhado entre threads (janela deslizante)"""
+
+    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE, tokens_per_minute: int = TOKENS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._events = deque()  # (instante, tokens)
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._events and now - self._events[0][0] >= 60:
+                    self._tokens -= self._events.popleft()[1]
+                fits = (len(self._events) < self.requests_per_minute
+                        and self._tokens + tokens <= self.tokens_per_minute)
+                if fits or not self._events:  # um lote maior que o limite passa sozinho
+                    self._events.append((now, tokens))
+                    self._tokens += tokens
+                    return
+                wait = 60 - (now - self._events[0][0])
+            time.sleep(min(max(wait, 0.01), 1.0))
+
+
+class BatchedEmbeddings(Embeddings):
+    """Embeddings da OpenAI com lotes por orçamento de tokens, lotes em paralelo e cache em disco.
+
+    Textos já vistos com o mesmo modelo saem do cache; os demais são
+    deduplicados, agrupados em lotes de até `max_batch_tokens` e enviados por
+    `concurrency` threads sob o RateLimiter. `stats` acumula o que foi
+    processado para medir chunks/s.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_batch_tokens: int = MAX_BATCH_TOKENS,
+        cache: Optional[EmbeddingCache] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.concurrency = concurrency
+        self.max_batch_tokens = max_batch_tokens
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.stats = {"chunks": 0, "cached": 0, "embedded": 0, "batches": 0, "tokens": 0, "seconds": 0.0}
+
+    def _batches(self, texts: List[Tuple[str, str]]) -> Iterator[List[Tuple[str, str, int]]]:
+        batch, used = [], 0
+        for key, text in texts:
+            tokens = estimate_tokens(text)
+            if batch and (used + tokens > self.max_batch_tokens or len(batch) >= MAX_BATCH_INPUTS):
+                yield batch
+                batch, used = [], 0
+            batch.append((key, text, tokens))
+            used += tokens
+        if batch:
+            yield batch
+
+    def _embed_batch(self, batch: List[Tuple[str, str, int]]) -> List[Tuple[str, List[float]]]:
+        self.rate_limiter.acquire(sum(tokens for _, _, tokens in batch))
+        response = get_client(self.api_key).embeddings.create(
+            model=self.model,
+            input=[text or " " for _, text, _ in batch]  # a API rejeita textos vazios
+        )
+        vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return [(key, vector) for (key, _, _), vector in zip(batch, vectors)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        keys = [text_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.model, list(set(keys)))
+        cached = sum(1 for key in keys if key in vectors)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        batches = list(self._batches(list(missing.items())))
+        if batches:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = [pool.submit(self._embed_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    results = future.result()
+                    self.cache.put_many(self.model, results)
+                    vectors.update(results)
+
+        self.stats["chunks"] += len(texts)
+        self.stats["cached"] += cached
+        self.stats["embedded"] += len(missing)
+        self.stats["batches"] += len(batches)
+        self.stats["tokens"] += sum(tokens for batch in batches for _, _, tokens in batch)
+        self.stats["seconds"] += time.perf_counter() - start
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+        self.stats["seconds"] = 0.0
+
+    def throughput(self) -> float:
+        """Chunks por segundo acumulados desde a criação"""
+        return self.stats["chunks"] / self.stats["seconds"] if self.stats["seconds"] else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a vazão de embeddings em lote (chunks/s) por concorrência")
+    parser.add_argument("file", help="arquivo de texto; cada parágrafo (separado por linha em branco) é um chunk")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-tokens", type=int, default=MAX_BATCH_TOKENS)
+    parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL)
+    parser.add_argument("--cache", help="arquivo de cache (padrão: cache temporário, para medir só a API)")
+    args = parser.parse_args()
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        chunks = [p.strip() for p in f.read().split("\n\n") if p.strip()]
+    print(f"{len(chunks)} chunks")
+
+    for concurrency in args.concurrency:
+        cache = EmbeddingCache(args.cache or f"./.embedding_bench_{os.getpid()}_{concurrency}.sqlite")
+        embeddings = BatchedEmbeddings(model=args.model, concurrency=concurrency,
+                                       max_batch_tokens=args.batch_tokens, cache=cache)
+        try:
+            embeddings.embed_documents(chunks)
+        finally:
+            cache.close()
+            if not args.cache:
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(cache.path + suffix):
+                        os.remove(cache.path + suffix)
+        stats = embeddings.stats
+        print(f"concorrência {concurrency:>2}: {embeddings.throughput():8.1f} chunks/s "
+              f"({stats['batches']} lotes, {stats['cached']} do cache, {stats['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
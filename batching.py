@@ -0,0 +1,51 @@
+import asyncio
+import time
+from itertools import islice
+from typing import Awaitable, Callable, Iterable, Iterator, List, Optional
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Agrupa um iterável em listas de até `size` itens, sem materializar a entrada"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def run_batches(batches: Iterable[List], worker: Callable[[List], Awaitable[List]],
+                      handle: Callable[[List, Optional[List], Optional[Exception]], None],
+                      concurrency: int, report: Optional[Callable[[float], None]] = None,
+                      report_every: float = 5.0):
+    """Executa worker(lote) para cada lote com no máximo `concurrency` lotes em voo.
+
+    handle(lote, resultados, erro) é chamado conforme os lotes terminam; se o
+    worker falhar, resultados é None e erro traz a exceção. Como os lotes só
+    são lidos quando há vaga, a memória não depende do tamanho da entrada.
+    `report(segundos)` é chamado no máximo a cada `report_every` segundos.
+    """
+    start = last_report = time.perf_counter()
+    pending = set()
+
+    def finish(done):
+        for task in done:
+            try:
+                results = task.result()
+            except Exception as e:
+                handle(task.batch, None, e)
+            else:
+                handle(task.batch, results, None)
+
+    for batch in batches:
+        if len(pending) >= concurrency:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finish(done)
+            now = time.perf_counter()
+            if report is not None and now - last_report >= report_every:
+                report(now - start)
+                last_report = now
+        task = asyncio.create_task(worker(batch))
+        task.batch = batch
+        pending.add(task)
+
+    if pending:
+        done, _ = await asyncio.wait(pending)
+        finish(done)
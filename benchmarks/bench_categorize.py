@@ -0,0 +1,123 @@
+"""Benchmark da categorização de tecnologias do 3_1.py.
+
+Compara a busca original (substring de cada nome da taxonomia dentro do
+termo, para cada categoria) com o índice de aliases compilado (TechIndex),
+em uma entrada sintética de termos parecidos com os devolvidos pela extração.
+Uma segunda rodada repete a comparação com a taxonomia ampliada por nomes
+aprendidos, onde a busca original fica proporcional ao tamanho da taxonomia.
+
+Uso:
+    python benchmarks/bench_categorize.py [--terms N] [--seed S]
+"""
+import argparse
+import importlib
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+extractor = importlib.import_module("3_1")
+
+SUFFIXES = ["", "", "", ".js", " 3", " framework", " cloud", " ci/cd", " (avançado)"]
+UNKNOWN = ["machine learning", "scrum", "kanban", "microsserviços", "rabbitmq", "kafka", "airflow",
+           "power bi", "excel", "figma", "jira", "selenium", "cypress", "graphql", "rest", "spark"]
+
+
+def synthetic_terms(count, seed=42):
+    rng = random.Random(seed)
+    known = [name for names in extractor.TECH_CATEGORIES.values() for name in names]
+    terms = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            name = rng.choice(known) + rng.choice(SUFFIXES)
+            if rng.random() < 0.3:  # versões deixam a maioria dos termos distinta
+                name += f" {rng.randint(1, 30)}.{rng.randint(0, 99)}"
+        else:
+            name = rng.choice(UNKNOWN)
+        terms.append(name.title() if rng.random() < 0.5 else name)
+    return terms
+
+
+def grown_taxonomy(extra, seed=42):
+    """Taxonomia original mais `extra` nomes aprendidos, como a que o 3_1.py acumula com o tempo"""
+    rng = random.Random(seed)
+    taxonomy = {category: list(names) for category, names in extractor.TECH_CATEGORIES.items()}
+    taxonomy[extractor.OTHER_CATEGORY] = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))) for _ in range(extra)
+    ]
+    return taxonomy
+
+
+def legacy_categorize(terms, taxonomy=None):
+    """Algoritmo original: `tech_name in tech_lower` para cada nome de cada categoria"""
+    taxonomy = taxonomy or extractor.TECH_CATEGORIES
+    result = []
+    for tech in terms:
+        tech_lower = tech.lower()
+        for category, tech_list in taxonomy.items():
+            if any(tech_name in tech_lower for tech_name in tech_list):
+                result.append(category)
+                break
+        else:
+            result.append(extractor.OTHER_CATEGORY)
+    return result
+
+
+def indexed_categorize(terms, index, memo=True):
+    memo_size = extractor.MEMO_SIZE
+    extractor.MEMO_SIZE = memo_size if memo else 0  # 0: cada termo novo descarta o memo
+    try:
+        return [index.categorize(tech) or extractor.OTHER_CATEGORY for tech in terms]
+    finally:
+        extractor.MEMO_SIZE = memo_size
+
+
+def measure(label, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {elapsed:7.2f}s  {count / elapsed / 1e6:6.2f} M termos/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terms", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--grow", type=int, default=2000, help="nomes extras na rodada com taxonomia ampliada")
+    args = parser.parse_args()
+
+    terms = synthetic_terms(args.terms, args.seed)
+    print(f"{len(terms)} termos, {len(set(t.lower() for t in terms))} distintos\n")
+
+    start = time.perf_counter()
+    index = extractor.TechIndex()
+    print(f"{'compilação do índice':<30} {(time.perf_counter() - start) * 1e3:7.2f}ms ({len(index)} aliases)")
+
+    legacy, legacy_time = measure("substring (original)", lambda: legacy_categorize(terms), len(terms))
+    _, raw_time = measure("índice de aliases (sem memo)", lambda: indexed_categorize(terms, index, memo=False),
+                          len(terms))
+    index = extractor.TechIndex()
+    indexed, indexed_time = measure("índice de aliases", lambda: indexed_categorize(terms, index), len(terms))
+    print(f"\nSpeedup: {legacy_time / raw_time:.1f}x sem memo, {legacy_time / indexed_time:.1f}x com memo")
+
+    changed = Counter((term.lower(), old, new) for term, old, new in zip(terms, legacy, indexed) if old != new)
+    print(f"\n{sum(changed.values())} termos categorizados de forma diferente; exemplos mais comuns:")
+    for (term, old, new), count in changed.most_common(10):
+        print(f"  {term!r}: {old} -> {new} ({count}x)")
+
+    if args.grow:
+        taxonomy = grown_taxonomy(args.grow, args.seed)
+        sample = terms[:max(1, len(terms) // 10)]
+        print(f"\nTaxonomia com {args.grow} nomes extras ({len(sample)} termos):")
+        _, legacy_time = measure("substring (original)", lambda: legacy_categorize(sample, taxonomy), len(sample))
+        index = extractor.TechIndex(taxonomy)
+        _, raw_time = measure("índice de aliases (sem memo)", lambda: indexed_categorize(sample, index, memo=False),
+                              len(sample))
+        print(f"\nSpeedup: {legacy_time / raw_time:.1f}x sem memo")
+
+
+if __name__ == "__main__":
+    main()
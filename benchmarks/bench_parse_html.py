@@ -0,0 +1,111 @@
+"""Micro-benchmark do parse de páginas do 2_3.py.
+
+Compara o caminho original (BeautifulSoup + html.parser na página inteira)
+com o caminho rápido (lxml extraindo só o div[role=main] e os hrefs), em
+série e com pool de processos.
+
+Uso:
+    python benchmarks/bench_parse_html.py [DIRETORIO_COM_HTML] [--repeat N]
+
+Sem diretório, usa um corpus sintético fixo de páginas no formato do
+Read the Docs. Para um corpus real, salve páginas com, por exemplo,
+`wget -r -l 2 -A html https://requests.readthedocs.io/en/latest/`.
+"""
+import argparse
+import glob
+import importlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+scraper = importlib.import_module("2_3")
+
+BASE_URL = "https://docs.example.com/en/latest/"
+DOMAIN = "docs.example.com"
+
+
+def synthetic_corpus(pages=200, seed=42):
+    rng = random.Random(seed)
+    words = ["request", "session", "adapter", "timeout", "header", "cookie", "proxy", "stream", "auth", "response"]
+    corpus = []
+    for i in range(pages):
+        nav = "".join(f'<li><a href="page{rng.randrange(500)}.html">Link {j}</a></li>' for j in range(150))
+        sections = []
+        for s in range(rng.randint(5, 15)):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(80, 200)))
+            code = "\n".join(f"r = requests.get(url, timeout={k})" for k in range(rng.randint(2, 8)))
+            sections.append(
+                f'<div class="section" id="s{s}"><h2>Seção {s}<a class="headerlink" href="#s{s}">¶</a></h2>'
+                f'<p>{text}</p><div class="highlight"><pre>{code}</pre></div>'
+                f'<p>Veja <a href="api.html#{s}">a API</a>.</p></div>'
+            )
+        corpus.append(
+            f'<!DOCTYPE html><html><head><title>Página {i}</title>'
+            f'<script>var x = {i};</script></head><body>'
+            f'<nav class="sidebar"><ul>{nav}</ul></nav>'
+            f'<div role="main" class="document"><h1>Página {i}</h1>{"".join(sections)}</div>'
+            f'<footer>{" ".join(words) * 20}</footer></body></html>'
+        )
+    return corpus
+
+
+def load_corpus(directory):
+    paths = sorted(glob.glob(os.path.join(directory, "**", "*.html"), recursive=True))
+    corpus = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            corpus.append(f.read())
+    return corpus
+
+
+def run_serial(corpus, parser):
+    for html in corpus:
+        scraper.extract_page(html, BASE_URL, DOMAIN, parser=parser)
+
+
+def run_pool(corpus, parser, processes):
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(scraper.extract_page, html, BASE_URL, DOMAIN, None, parser) for html in corpus]
+        for future in futures:
+            future.result()
+
+
+def measure(label, func, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    size_mb = sum(len(html) for html in corpus) / 1e6
+    print(f"{label:<32} {best:7.2f}s  {len(corpus) / best:8.1f} páginas/s  {size_mb / best:7.1f} MB/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", help="diretório com páginas .html salvas")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.directory) if args.directory else synthetic_corpus()
+    if not corpus:
+        print("Nenhuma página encontrada.")
+        return
+    print(f"{len(corpus)} páginas, {sum(len(h) for h in corpus) / 1e6:.1f} MB\n")
+
+    baseline = measure("html.parser (original)", lambda: run_serial(corpus, "html.parser"), corpus, args.repeat)
+    if scraper.lxml is None:
+        print("lxml não instalado; apenas o caminho original foi medido.")
+        return
+    fast = measure("lxml", lambda: run_serial(corpus, "lxml"), corpus, args.repeat)
+    pooled = measure(f"lxml + {args.processes} processos", lambda: run_pool(corpus, "lxml", args.processes),
+                     corpus, args.repeat)
+    print(f"\nSpeedup lxml: {baseline / fast:.1f}x | lxml + processos: {baseline / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark do índice vetorial nativo (vector_index.py) contra o Chroma.
+
+Gera embeddings sintéticos agrupados (parecidos com chunks de poucos
+documentos), calcula a resposta exata em float32 e mede recall@k e latência
+(p50/p95) da busca exata do VectorIndex em float16 e float32, do modo IVF
+com alguns valores de nprobe e, se o chromadb estiver instalado, do Chroma
+(HNSW) com os mesmos vetores. Também mede a abertura a frio do índice, que
+é só um mmap.
+
+Uso:
+    python benchmarks/bench_vector_index.py [--vectors N] [--dim D] [--queries Q] [--k K]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vector_index import VectorIndex, normalize
+
+try:
+    import chromadb
+except ImportError:
+    chromadb = None
+
+ADD_BATCH = 5000
+
+
+def synthetic_vectors(count, dim, clusters, seed=42):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, dim))
+    return normalize(vectors)
+
+
+def synthetic_queries(vectors, count, seed=43):
+    rng = np.random.default_rng(seed)
+    return normalize(vectors[rng.integers(0, len(vectors), count)] + 0.4 * rng.normal(size=(count, vectors.shape[1])))
+
+
+def ground_truth(vectors, queries, k):
+    return [set(np.argpartition(-(vectors @ query), k - 1)[:k]) for query in queries]
+
+
+def measure(label, search, queries, truth, k):
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        rows = search(query)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(rows) & expected)
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1e3
+    print(f"{label:<28} recall@{k} {hits / (k * len(queries)):6.3f}   p50 {p50:8.2f}ms   p95 {p95:8.2f}ms")
+
+
+def build_native(directory, vectors, dtype):
+    index = VectorIndex(directory, dtype=dtype)
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), ADD_BATCH):
+        batch = vectors[offset:offset + ADD_BATCH]
+        index.add([str(offset + i) for i in range(len(batch))], batch)
+    print(f"{'carga ' + dtype:<28} {time.perf_counter() - start:7.2f}s")
+    index.close()
+
+
+def bench_chroma(directory, vectors, queries, truth, k):
+    client = chromadb.PersistentClient(path=directory)
+    collection = client.create_collection("bench", metadata={"hnsw:space": "cosine"})
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), ADD_BATCH):
+        batch = vectors[offset:offset + ADD_BATCH]
+        collection.add(ids=[str(offset + i) for i in range(len(batch))], embeddings=batch.tolist())
+    print(f"{'carga chroma':<28} {time.perf_counter() - start:7.2f}s")
+
+    def search(query):
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k)
+        return [int(doc_id) for doc_id in result["ids"][0]]
+
+    measure("chroma (hnsw)", search, queries, truth, k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5, help="o mesmo k do retriever do 6_1.py")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    vectors = synthetic_vectors(args.vectors, args.dim, args.clusters)
+    queries = synthetic_queries(vectors, args.queries)
+    truth = ground_truth(vectors, queries, args.k)
+    print(f"{len(vectors)} vetores de dimensão {args.dim}, {len(queries)} consultas\n")
+
+    workdir = tempfile.mkdtemp(prefix="bench_vector_index_")
+    try:
+        for dtype in ("float32", "float16"):
+            directory = os.path.join(workdir, dtype)
+            build_native(directory, vectors, dtype)
+            start = time.perf_counter()
+            index = VectorIndex(directory)
+            index.vectors()
+            print(f"{'abertura a frio ' + dtype:<28} {(time.perf_counter() - start) * 1e3:7.2f}ms")
+            measure(f"exata {dtype}", lambda q: [row for row, _ in index.search(q, args.k)], queries, truth, args.k)
+            if dtype == "float16":
+                start = time.perf_counter()
+                nlist = index.build_ivf()
+                print(f"{'treino ivf':<28} {time.perf_counter() - start:7.2f}s ({nlist} listas)")
+                for nprobe in args.nprobe:
+                    measure(f"ivf float16 nprobe={nprobe}",
+                            lambda q: [row for row, _ in index.search(q, args.k, nprobe=nprobe)],
+                            queries, truth, args.k)
+            index.close()
+            print()
+
+        if chromadb is None:
+            print("chromadb não instalado; comparação com o Chroma omitida.")
+        else:
+            bench_chroma(os.path.join(workdir, "chroma"), vectors, queries, truth, args.k)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
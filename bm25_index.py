@@ -0,0 +1,196 @@
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set
+
+from langchain.schema import Document
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60  # constante da reciprocal rank fusion; 60 é o valor usual
+TOKEN_PATTERN = re.compile(r"\w+(?:[-./]\w+)*")
+STOPWORDS = frozenset(
+    "a o as os um uma uns umas de do da dos das em no na nos nas por para pelo pela com sem sob sobre "
+    "e ou que qual quais quando onde como se ao aos à às é são ser foi há tem ter seu sua seus suas "
+    "meu minha este esta isso isto esse essa aquele aquela mais menos muito já não sim "
+    "the an of to in on for by with and or is are was be what which who how when where does do".split()
+)
+
+
+class Hit(NamedTuple):
+    id: str
+    score: float
+    coverage: float  # fração (ponderada por idf) dos termos da consulta presentes no trecho
+
+
+def _fold(text: str) -> str:
+    """Minúsculas e sem acentos, para que "férias" e "ferias" virem o mesmo termo"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Termos do texto; códigos como "POL-123" ou "4.2.1" geram o termo inteiro e as partes"""
+    terms = []
+    for token in TOKEN_PATTERN.findall(_fold(text)):
+        if token not in STOPWORDS:
+            terms.append(token)
+        if any(sep in token for sep in "-./"):
+            terms.extend(part for part in re.split(r"[-./]", token) if part and part not in STOPWORDS)
+    return terms
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence], k: int = RRF_K) -> List:
+    """Funde listas ordenadas de chaves somando 1 / (k + posição) de cada lista"""
+    scores: Dict = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def lexical_margin(hits: List[Hit]) -> float:
+    """Quanto o primeiro resultado se destaca do segundo: (s1 - s2) / s1"""
+    if not hits:
+        return 0.0
+    if len(hits) == 1:
+        return 1.0
+    return (hits[0].score - hits[1].score) / hits[0].score if hits[0].score else 0.0
+
+
+class BM25Index:
+    """Índice invertido BM25 em SQLite, atualizado junto com o índice vetorial.
+
+    Cada trecho guarda texto, metadados e tamanho; `postings` tem a
+    frequência de cada termo por trecho. A busca lê só as listas dos termos
+    da consulta, sem chamar a API de embeddings.
+    """
+
+    def __init__(self, path: str, k1: float = BM25_K1, b: float = BM25_B):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS docs (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                length INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id)")
+        self._conn.commit()
+        self._totals = None  # (número de trechos, tamanho médio), recalculado após escritas
+
+    def _stats(self):
+        if self._totals is None:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+            self._totals = (count, total / count if count else 0.0)
+        return self._totals
+
+    def __len__(self):
+        with self._lock:
+            return self._stats()[0]
+
+    def _delete(self, ids: List[str]):
+        for start in range(0, len(ids), 500):  # limite de parâmetros do SQLite
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self._conn.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", chunk)
+            self._conn.execute(f"DELETE FROM docs WHERE id IN ({placeholders})", chunk)
+
+    def add(self, ids: Sequence[str], documents: Sequence[Document]):
+        """Indexa os trechos; ids já presentes são substituídos"""
+        docs, postings = [], []
+        for doc_id, document in zip(ids, documents):
+            terms = Counter(tokenize(document.page_content))
+            docs.append((doc_id, document.page_content, json.dumps(document.metadata, ensure_ascii=False),
+                         sum(terms.values())))
+            postings.extend((term, doc_id, tf) for term, tf in terms.items())
+        with self._lock:
+            self._delete(list(ids))
+            self._conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?)", docs)
+            self._conn.executemany("INSERT INTO postings VALUES (?, ?, ?)", postings)
+            self._conn.commit()
+            self._totals = None
+
+    def delete(self, ids: Iterable[str]):
+        with self._lock:
+            self._delete(list(ids))
+            self._conn.commit()
+            self._totals = None
+
+    def missing(self, ids: Iterable[str]) -> Set[str]:
+        """Ids que ainda não estão no índice (por exemplo, de uma ingestão anterior a ele)"""
+        ids = list(ids)
+        found = set()
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                found.update(row[0] for row in self._conn.execute(
+                    f"SELECT id FROM docs WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        return set(ids) - found
+
+    def search(self, query: str, k: int = 5) -> List[Hit]:
+        terms = Counter(tokenize(query))
+        if not terms or k <= 0:
+            return []
+        scores: Dict[str, float] = {}
+        matched: Dict[str, float] = {}
+        total_idf = 0.0
+        with self._lock:
+            count, avg_length = self._stats()
+            if not count:
+                return []
+            avg_length = avg_length or 1.0
+            for term, query_tf in terms.items():
+                rows = self._conn.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id WHERE p.term = ?",
+                    (term,)
+                ).fetchall()
+                # termos fora do vocabulário entram no total com o idf máximo: pesam contra a cobertura
+                idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+                total_idf += idf * query_tf
+                for doc_id, tf, length in rows:
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[doc_id] = matched.get(doc_id, 0.0) + idf * query_tf
+        best = heapq.nlargest(k, scores, key=scores.get)
+        return [Hit(doc_id, scores[doc_id], matched[doc_id] / total_idf if total_idf else 0.0) for doc_id in best]
+
+    def documents(self, ids: Sequence[str]) -> List[Document]:
+        """Trechos na ordem pedida"""
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, text, metadata FROM docs WHERE id IN ({','.join('?' * len(ids))})", list(ids)
+            ).fetchall()
+        found = {doc_id: Document(page_content=text, metadata=json.loads(metadata)) for doc_id, text, metadata in rows}
+        return [found[doc_id] for doc_id in ids if doc_id in found]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,267 @@
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Iterator, Optional, Tuple
+
+KINDS = ("markdown", "summary")
+DEFAULT_SHARDS = 16
+
+
+def summary_filename(filename: str) -> str:
+    return filename[:-len(".md")] + ".summary.md" if filename.endswith(".md") else filename + ".summary.md"
+
+
+class FileStore:
+    """Layout original: um .md e um .summary.md por página em um diretório"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, filename: str, kind: str) -> str:
+        return os.path.join(self.directory, summary_filename(filename) if kind == "summary" else filename)
+
+    def put(self, url: str, filename: str, kind: str, text: str):
+        path = self._path(filename, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def has(self, url: str, filename: str, kind: str = "markdown") -> bool:
+        return os.path.exists(self._path(filename, kind))
+
+    def close(self):
+        pass
+
+
+class ShardedDocStore:
+    """Armazena páginas em shards JSONL comprimidos com índice URL -> offset em SQLite.
+
+    Cada registro é gravado como um membro gzip independente no fim do shard,
+    então um registro pode ser lido com um seek + uma descompressão, e o shard
+    inteiro continua sendo um .gz válido. Regravar uma URL só atualiza o
+    índice; compact() remove as versões antigas. Os novos offsets de um shard
+    compactado são confirmados no SQLite junto com uma marca em `meta` antes
+    da troca do arquivo, e _recover() termina ou descarta, ao abrir, uma
+    compactação interrompida.
+    """
+
+    def __init__(self, directory: str, shards: int = DEFAULT_SHARDS):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite"))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS records (
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (url, kind)
+            )"""
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'shards'").fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO meta VALUES ('shards', ?)", (str(shards),))
+            self._conn.commit()
+            self.shards = shards
+        else:
+            self.shards = int(row[0])  # o número de shards é fixado na criação do store
+        self._files = {}
+        self._pending = 0
+        self._recover()
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.directory, f"shard-{shard:03d}.jsonl.gz")
+
+    def _compact_path(self, shard: int) -> str:
+        return self._shard_path(shard) + ".compact"
+
+    def _recover(self):
+        """Conclui a troca de um shard cuja compactação já foi confirmada e apaga as que não foram"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'compacting'").fetchone()
+        if row is not None:  # offsets novos já no SQLite: o shard precisa ser o arquivo compactado
+            shard = int(row[0])
+            if os.path.exists(self._compact_path(shard)):
+                os.replace(self._compact_path(shard), self._shard_path(shard))
+            self._conn.execute("DELETE FROM meta WHERE key = 'compacting'")
+            self._conn.commit()
+        for shard in range(self.shards):  # interrompidas antes do commit: os offsets antigos valem
+            if os.path.exists(self._compact_path(shard)):
+                os.remove(self._compact_path(shard))
+
+    def _shard_for(self, url: str) -> int:
+        return zlib.crc32(url.encode("utf-8")) % self.shards
+
+    def _file(self, shard: int):
+        f = self._files.get(shard)
+        if f is None:
+            f = open(self._shard_path(shard), "ab")
+            self._files[shard] = f
+        return f
+
+    def put(self, url: str, filename: str, kind: str, text: str):
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de registro inválido: {kind}")
+        record = json.dumps({"url": url, "kind": kind, "filename": filename, "text": text}, ensure_ascii=False)
+        data = gzip.compress((record + "\n").encode("utf-8"), compresslevel=6)
+
+        shard = self._shard_for(url)
+        f = self._file(shard)
+        offset = f.seek(0, os.SEEK_END)
+        f.write(data)
+        f.flush()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, kind, filename, shard, offset, len(data), time.time())
+        )
+        self._pending += 1
+        if self._pending >= 100:
+            self._conn.commit()
+            self._pending = 0
+
+    def has(self, url: str, filename: Optional[str] = None, kind: str = "markdown") -> bool:
+        row = self._conn.execute("SELECT 1 FROM records WHERE url = ? AND kind = ?", (url, kind)).fetchone()
+        return row is not None
+
+    def _read(self, shard: int, offset: int, length: int, handle=None) -> dict:
+        if shard in self._files:
+            self._files[shard].flush()
+        if handle is None:
+            with open(self._shard_path(shard), "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        else:
+            handle.seek(offset)
+            data = handle.read(length)
+        return json.loads(gzip.decompress(data))
+
+    def get(self, url: str, kind: str = "markdown") -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT shard, offset, length FROM records WHERE url = ? AND kind = ?", (url, kind)
+        ).fetchone()
+        return self._read(*row)["text"] if row else None
+
+    def iter_records(self, kind: Optional[str] = None) -> Iterator[Tuple[str, str, str, str]]:
+        """Percorre os registros atuais em ordem de arquivo, gerando (url, kind, filename, texto)"""
+        for f in self._files.values():
+            f.flush()
+        query = "SELECT shard, offset, length FROM records"
+        params = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        rows = self._conn.execute(query + " ORDER BY shard, offset", params)
+
+        current_shard, handle = None, None
+        try:
+            for shard, offset, length in rows:
+                if shard != current_shard:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(self._shard_path(shard), "rb")
+                    current_shard = shard
+                record = self._read(shard, offset, length, handle)
+                yield record["url"], record["kind"], record["filename"], record["text"]
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(DISTINCT url) FROM records").fetchone()[0]
+
+    def export_files(self, output_dir: str) -> int:
+        """Recria o layout de arquivos original (.md / .summary.md) em output_dir"""
+        target = FileStore(output_dir)
+        count = 0
+        for url, kind, filename, text in self.iter_records():
+            target.put(url, filename, kind, text)
+            count += 1
+        return count
+
+    def compact(self):
+        """Regrava cada shard só com as versões atuais dos registros"""
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+        for shard in range(self.shards):
+            path = self._shard_path(shard)
+            if not os.path.exists(path):
+                continue
+            rows = self._conn.execute(
+                "SELECT url, kind, offset, length FROM records WHERE shard = ? ORDER BY offset", (shard,)
+            ).fetchall()
+            tmp_path = self._compact_path(shard)
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                for url, kind, offset, length in rows:
+                    src.seek(offset)
+                    new_offset = dst.tell()
+                    dst.write(src.read(length))
+                    self._conn.execute(
+                        "UPDATE records SET offset = ? WHERE url = ? AND kind = ?", (new_offset, url, kind)
+                    )
+                dst.flush()
+                os.fsync(dst.fileno())
+            # os offsets novos e a marca são confirmados juntos, antes da troca do arquivo
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('compacting', ?)", (str(shard),))
+            self._conn.commit()
+            os.replace(tmp_path, path)
+            self._conn.execute("DELETE FROM meta WHERE key = 'compacting'")
+            self._conn.commit()
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Utilitários do store compactado de páginas")
+    parser.add_argument("store", help="diretório do store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="exporta para o layout de arquivos .md")
+    export.add_argument("output_dir")
+    get = sub.add_parser("get", help="imprime o Markdown (ou resumo) de uma URL")
+    get.add_argument("url")
+    get.add_argument("--kind", choices=KINDS, default="markdown")
+    sub.add_parser("compact", help="remove versões antigas dos shards")
+    sub.add_parser("stats", help="mostra o número de páginas e o tamanho em disco")
+    args = parser.parse_args()
+
+    store = ShardedDocStore(args.store)
+    try:
+        if args.command == "export":
+            print(f"{store.export_files(args.output_dir)} arquivos exportados para {args.output_dir}")
+        elif args.command == "get":
+            text = store.get(args.url, args.kind)
+            print(text if text is not None else "URL não encontrada no store.")
+        elif args.command == "compact":
+            store.compact()
+            print("Store compactado.")
+        elif args.command == "stats":
+            size = sum(os.path.getsize(store._shard_path(s)) for s in range(store.shards)
+                       if os.path.exists(store._shard_path(s)))
+            print(f"{len(store)} páginas em {store.shards} shards ({size / 1e6:.1f} MB)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
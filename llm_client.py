@@ -0,0 +1,164 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+import httpx
+import openai
+
+from llm_cache import ResponseCache
+
+# Pool HTTP compartilhado: reaproveita conexões keep-alive (sem novo handshake TLS a cada chamada)
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+DEFAULT_MODEL = "gpt-4o-mini"
+
+_http_client: Optional[httpx.Client] = None
+_clients: Dict[str, openai.OpenAI] = {}
+# Um dicionário {chave: cliente} por event loop; some junto com o loop quando ele é coletado
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, openai.AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def _resolve_api_key(api_key: Optional[str]) -> str:
+    return api_key or os.getenv("OPENAI_API_KEY", "")
+
+
+def get_http_client() -> httpx.Client:
+    """Retorna o httpx.Client compartilhado por todos os clientes síncronos"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=POOL_LIMITS, timeout=DEFAULT_TIMEOUT)
+        return _http_client
+
+
+def get_client(api_key: Optional[str] = None) -> openai.OpenAI:
+    """Retorna um cliente OpenAI síncrono reutilizável (um por chave de API)"""
+    key = _resolve_api_key(api_key)
+    http_client = get_http_client()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = openai.OpenAI(api_key=key, http_client=http_client, timeout=DEFAULT_TIMEOUT)
+            _clients[key] = client
+        return client
+
+
+def get_async_client(api_key: Optional[str] = None) -> openai.AsyncOpenAI:
+    """Retorna um cliente OpenAI assíncrono reutilizável para o event loop atual.
+
+    Conexões assíncronas ficam presas ao loop em que foram criadas, por isso o
+    pool é mantido por loop (e por chave dentro dele). Entradas de loops já
+    fechados são descartadas; feche os clientes com aclose_clients() antes de
+    o loop terminar.
+    """
+    key = _resolve_api_key(api_key)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        for closed in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[closed]
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=DEFAULT_TIMEOUT)
+            client = openai.AsyncOpenAI(api_key=key, http_client=http_client, timeout=DEFAULT_TIMEOUT)
+            clients[key] = client
+        return client
+
+
+def chat_completion(
+    messages: List[Dict],
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.2,
+    max_tokens: int = 500,
+    api_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[ResponseCache] = None,
+    **kwargs
+) -> str:
+    """Faz uma chamada de chat usando o pool compartilhado e retorna o texto da resposta.
+
+    Com `cache`, respostas repetidas para o mesmo modelo, mensagens e parâmetros
+    são servidas localmente, sem ida à API.
+    """
+    if cache is not None:
+        key = ResponseCache.make_key(model, messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = get_client(api_key).chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=timeout or DEFAULT_TIMEOUT,
+        **kwargs
+    )
+    content = response.choices[0].message.content
+    if cache is not None and content is not None:
+        cache.set(key, content)
+    return content
+
+
+async def achat_completion(
+    messages: List[Dict],
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.2,
+    max_tokens: int = 500,
+    api_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[ResponseCache] = None,
+    **kwargs
+) -> str:
+    """Versão assíncrona de chat_completion"""
+    if cache is not None:
+        key = ResponseCache.make_key(model, messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = await get_async_client(api_key).chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=timeout or DEFAULT_TIMEOUT,
+        **kwargs
+    )
+    content = response.choices[0].message.content
+    if cache is not None and content is not None:
+        cache.set(key, content)
+    return content
+
+
+def close_clients():
+    """Fecha o pool síncrono (os clientes assíncronos são fechados com aclose_clients)"""
+    global _http_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+        _clients.clear()
+
+
+async def aclose_clients():
+    """Fecha os clientes assíncronos do event loop atual"""
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+def run_async(coroutine):
+    """asyncio.run que fecha os clientes assíncronos antes de o loop terminar"""
+    async def runner():
+        try:
+            return await coroutine
+        finally:
+            await aclose_clients()
+    return asyncio.run(runner())
@@ -0,0 +1,159 @@
+import argparse
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pypdf import PdfReader
+
+PAGES_PER_TASK = 25  # páginas extraídas por tarefa do pool
+MAX_PENDING_PER_PROCESS = 2  # tarefas em voo por processo; limita a memória do lote
+
+_worker_reader: Tuple[Optional[str], Optional[PdfReader]] = (None, None)  # último PDF aberto neste processo
+
+
+class PdfPage(NamedTuple):
+    source: str
+    page: int  # começa em 0, como no PyPDFLoader
+    text: str
+
+
+def page_count(data: bytes) -> int:
+    return len(PdfReader(io.BytesIO(data)).pages)
+
+
+def _extract(reader: PdfReader, source: str, start: int, end: int) -> List[PdfPage]:
+    return [PdfPage(source, number, reader.pages[number].extract_text() or "") for number in range(start, end)]
+
+
+def _shared_reader(name: str, size: int) -> PdfReader:
+    """PdfReader do PDF no bloco de memória compartilhada `name`, aberto uma vez por processo.
+
+    As tarefas de um mesmo PDF chegam em sequência, então o processo guarda o
+    último PdfReader e só copia os bytes e analisa o arquivo quando o PDF muda.
+    """
+    global _worker_reader
+    cached_name, reader = _worker_reader
+    if cached_name != name:
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            data = bytes(block.buf[:size])
+        finally:
+            block.close()
+        reader = PdfReader(io.BytesIO(data))
+        _worker_reader = (name, reader)
+    return reader
+
+
+def shared_page_count(name: str, size: int) -> int:
+    return len(_shared_reader(name, size).pages)
+
+
+def extract_page_range(source: str, name: str, size: int, start: int, end: int) -> List[PdfPage]:
+    """Extrai o texto das páginas [start, end) do PDF em memória compartilhada (roda nos processos do pool)"""
+    return _extract(_shared_reader(name, size), source, start, end)
+
+
+def _release(block: shared_memory.SharedMemory):
+    block.close()
+    block.unlink()
+
+
+def iter_pdf_pages(
+    files: Iterable[Tuple[str, bytes]],
+    processes: Optional[int] = None,
+    pages_per_task: int = PAGES_PER_TASK
+) -> Iterator[PdfPage]:
+    """Extrai as páginas de vários PDFs em memória, em paralelo, na ordem de arquivo e página.
+
+    Cada PDF é copiado uma vez para um bloco de memória compartilhada e
+    dividido em faixas de `pages_per_task` páginas distribuídas entre os
+    processos; as tarefas levam só (origem, bloco, faixa) e cada processo lê
+    e analisa um PDF uma única vez. A contagem de páginas também roda no
+    pool, alguns arquivos à frente. As páginas são geradas assim que a faixa
+    seguinte fica pronta, e só algumas faixas por processo ficam em voo, então
+    a memória não cresce com o tamanho do lote. Nada passa pelo disco.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for source, data in files:
+            reader = PdfReader(io.BytesIO(data))
+            for start in range(0, len(reader.pages), pages_per_task):
+                yield from _extract(reader, source, start, min(start + pages_per_task, len(reader.pages)))
+        return
+
+    files = iter(files)
+    blocks = []  # blocos ainda não liberados, apagados no fim mesmo se o gerador for interrompido
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            counting = deque()  # (origem, bloco, tamanho, future da contagem de páginas)
+            pending = deque()  # (future, bloco a liberar depois desta faixa)
+
+            def share_next():
+                item = next(files, None)
+                if item is None:
+                    return
+                source, data = item
+                block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+                block.buf[:len(data)] = data
+                blocks.append(block)
+                counting.append((source, block, len(data), pool.submit(shared_page_count, block.name, len(data))))
+
+            def release(block):
+                blocks.remove(block)
+                _release(block)
+
+            def consume():
+                future, done_block = pending.popleft()
+                yield from future.result()
+                if done_block is not None:
+                    release(done_block)
+
+            for _ in range(processes):
+                share_next()
+            while counting:
+                source, block, size, count = counting.popleft()
+                share_next()
+                total = count.result()
+                for start in range(0, total, pages_per_task):
+                    if len(pending) >= processes * MAX_PENDING_PER_PROCESS:
+                        yield from consume()
+                    end = min(start + pages_per_task, total)
+                    pending.append((pool.submit(extract_page_range, source, block.name, size, start, end),
+                                    block if end == total else None))
+                if not total:
+                    release(block)
+            while pending:
+                yield from consume()
+    finally:
+        for block in blocks:
+            _release(block)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrai o texto de PDFs em paralelo e mede a vazão (páginas/s)")
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pages-per-task", type=int, default=PAGES_PER_TASK)
+    args = parser.parse_args()
+
+    def read_files():
+        for path in args.pdfs:
+            with open(path, "rb") as f:
+                yield os.path.basename(path), f.read()
+
+    start = time.perf_counter()
+    pages = chars = 0
+    for page in iter_pdf_pages(read_files(), args.processes, args.pages_per_task):
+        pages += 1
+        chars += len(page.text)
+    elapsed = time.perf_counter() - start
+    print(f"{pages} páginas ({chars / 1e6:.1f} M caracteres) em {elapsed:.2f}s "
+          f"({pages / elapsed if elapsed else 0:.1f} páginas/s, {args.processes} processos)")
+
+
+if __name__ == "__main__":
+    main()
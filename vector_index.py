@@ -0,0 +1,424 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema import Document
+from langchain.vectorstores.base import VectorStore
+
+DEFAULT_DTYPE = "float16"
+SEARCH_BLOCK_BYTES = 64 * 1024 * 1024  # memória temporária por bloco na busca exata
+DEFAULT_NPROBE = 16  # listas visitadas por consulta no modo IVF
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 100_000  # vetores usados para treinar os centróides
+IVF_MIN_ROWS = 20_000  # abaixo disso a busca exata já é rápida o bastante
+IVF_STALE_RATIO = 0.1  # fração de linhas fora do IVF que dispara a reconstrução
+COMPACT_RATIO = 0.2  # fração de linhas apagadas que dispara o compact()
+
+
+def normalize(vectors) -> np.ndarray:
+    """Vetores em float32 com norma 1, para que o produto interno seja a similaridade de cosseno"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        scores, rows = scores[keep], rows[keep]
+    order = np.argsort(-scores, kind="stable")
+    return scores[order], rows[order]
+
+
+class VectorIndex:
+    """Índice vetorial em disco: embeddings num arquivo binário lido via np.memmap.
+
+    Abrir o índice só lê meta.json e mapeia o arquivo; as páginas são
+    carregadas sob demanda pelo sistema operacional. Os vetores são gravados
+    normalizados (float16 por padrão) e a busca exata é um produto matricial
+    em blocos. build_ivf() treina centróides com k-means e ordena as linhas
+    por lista, o que permite a busca aproximada visitando só `nprobe` listas.
+    Textos e metadados ficam em SQLite; remoções marcam a linha como apagada
+    até o próximo compact(). float16 ocupa metade do disco e da memória, mas
+    a busca exata paga a conversão para float32; com o IVF só os candidatos
+    são convertidos.
+
+    O commit no SQLite é o ponto de confirmação de add() e compact(): os
+    vetores são gravados antes dele e, ao abrir, _recover() completa ou
+    descarta o que uma interrupção deixou pela metade.
+    """
+
+    def __init__(self, directory: str, dim: Optional[int] = None, dtype: str = DEFAULT_DTYPE):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._vectors_path = os.path.join(directory, "vectors.bin")
+        self._compact_path = self._vectors_path + ".compact"
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"dim": dim, "dtype": dtype, "count": 0, "ivf_count": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "docs.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS docs (
+                row INTEGER PRIMARY KEY,
+                id TEXT NOT NULL,
+                text TEXT,
+                metadata TEXT,
+                deleted INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_id ON docs(id)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS journal (operation TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+        self._conn.commit()
+        self._recover()
+        self._deleted = np.zeros(self.count, dtype=bool)
+        for (row,) in self._conn.execute("SELECT row FROM docs WHERE deleted = 1"):
+            self._deleted[row] = True
+        self._vectors = None
+        self._ivf = None
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.meta["dim"]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self.meta["dtype"])
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    def __len__(self):
+        return self.count - int(self._deleted.sum())
+
+    def _save_meta(self):
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _row_bytes(self) -> int:
+        return (self.dim or 0) * self.dtype.itemsize
+
+    def _recover(self):
+        """Deixa vetores, SQLite e meta.json consistentes depois de um add() ou compact() interrompido"""
+        journal = self._conn.execute("SELECT count FROM journal WHERE operation = 'compact'").fetchone()
+        if journal is not None:  # o SQLite já foi renumerado: termina a troca do arquivo
+            if os.path.exists(self._compact_path):
+                os.replace(self._compact_path, self._vectors_path)
+            self.meta["count"] = journal[0]
+            self.meta["ivf_count"] = 0
+            self._save_meta()
+            self._conn.execute("DELETE FROM journal WHERE operation = 'compact'")
+            self._conn.commit()
+        elif os.path.exists(self._compact_path):  # interrompido antes do commit: o índice antigo vale
+            os.remove(self._compact_path)
+
+        (max_row,) = self._conn.execute("SELECT MAX(row) FROM docs").fetchone()
+        committed = max_row + 1 if max_row is not None else 0
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        if committed > self.count:  # add() confirmado no SQLite, mas meta.json não foi salvo
+            if self.dim and size >= committed * self._row_bytes():
+                self.meta["count"] = committed
+                self._save_meta()
+            else:
+                self._conn.execute("DELETE FROM docs WHERE row >= ?", (self.count,))
+                self._conn.commit()
+        if size > self.count * self._row_bytes():  # vetores de um add() não confirmado
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(self.count * self._row_bytes())
+
+    def vectors(self) -> np.ndarray:
+        """Matriz (count, dim) mapeada do disco, sem leitura antecipada"""
+        if self.count == 0:
+            return np.zeros((0, self.dim or 0), dtype=self.dtype)
+        if self._vectors is None or len(self._vectors) != self.count:
+            self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(self.count, self.dim))
+        return self._vectors
+
+    def add(self, ids: Sequence[str], vectors, texts: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[dict]] = None) -> List[int]:
+        """Acrescenta vetores ao fim do arquivo; ids já existentes são substituídos"""
+        vectors = normalize(vectors)
+        if len(vectors) != len(ids):
+            raise ValueError("O número de ids e de vetores deve ser igual")
+        if self.dim is None:
+            self.meta["dim"] = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Dimensão {vectors.shape[1]} diferente da do índice ({self.dim})")
+        texts = texts or [""] * len(ids)
+        metadatas = metadatas or [{}] * len(ids)
+
+        with self._lock:
+            start = self.count
+            # grava na posição da linha `start`, não no fim do arquivo: sobras de um add() interrompido
+            # são sobrescritas em vez de deslocar as linhas seguintes
+            with open(self._vectors_path, "r+b" if os.path.exists(self._vectors_path) else "wb") as f:
+                f.seek(start * self._row_bytes())
+                f.write(vectors.astype(self.dtype).tobytes())
+                f.truncate()
+            rows = self._delete(ids, commit=False)
+            self._conn.executemany(
+                "INSERT INTO docs (row, id, text, metadata) VALUES (?, ?, ?, ?)",
+                [(start + i, doc_id, text, json.dumps(metadata, ensure_ascii=False))
+                 for i, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas))]
+            )
+            self._conn.commit()
+            self._deleted[rows] = True
+            self.meta["count"] = start + len(ids)
+            self._save_meta()
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(ids), dtype=bool)])
+            self._vectors = None
+        return list(range(start, start + len(ids)))
+
+    def _delete(self, ids: Iterable[str], commit: bool = True) -> List[int]:
+        rows = []
+        ids = list(ids)
+        for start in range(0, len(ids), 500):  # limite de parâmetros do SQLite
+            chunk = ids[start:start + 500]
+            rows.extend(row for (row,) in self._conn.execute(
+                f"SELECT row FROM docs WHERE deleted = 0 AND id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        if rows:
+            self._conn.executemany("UPDATE docs SET deleted = 1 WHERE row = ?", [(row,) for row in rows])
+            if commit:
+                self._conn.commit()
+                self._deleted[rows] = True
+        return rows
+
+    def delete(self, ids: Iterable[str]) -> int:
+        with self._lock:
+            return len(self._delete(ids))
+
+    def _block_rows(self) -> int:
+        return max(1024, SEARCH_BLOCK_BYTES // (4 * (self.dim or 1)))
+
+    def _scan(self, query: np.ndarray, k: int, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        vectors = self.vectors()
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        step = self._block_rows()
+        for block_start in range(start, end, step):
+            block_end = min(block_start + step, end)
+            scores = vectors[block_start:block_end].astype(np.float32, copy=False) @ query
+            scores[self._deleted[block_start:block_end]] = -np.inf
+            rows = np.arange(block_start, block_end)
+            best_scores, best_rows = _top_k(np.concatenate([best_scores, scores]),
+                                            np.concatenate([best_rows, rows]), k)
+        return best_scores, best_rows
+
+    def search(self, query, k: int = 4, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Linhas mais similares a `query` como (linha, cosseno); com `nprobe` usa o IVF se houver"""
+        if self.count == 0 or k <= 0:
+            return []
+        query = normalize(query)[0]
+        if nprobe and self._load_ivf():
+            scores, rows = self._search_ivf(query, k, nprobe)
+        else:
+            scores, rows = self._scan(query, k, 0, self.count)
+        return [(int(row), float(score)) for row, score in zip(rows, scores) if score != -np.inf]
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = KMEANS_ITERATIONS,
+                  sample: int = KMEANS_SAMPLE, seed: int = 0) -> int:
+        """Treina `nlist` centróides (padrão: 4·√n) e agrupa as linhas por centróide mais próximo"""
+        count = self.count
+        if count == 0:
+            return 0
+        vectors = self.vectors()
+        nlist = max(1, min(nlist or int(4 * np.sqrt(count)), count))
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(count, size=min(sample, count), replace=False))
+        data = vectors[sample_rows].astype(np.float32)
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)]
+
+        for _ in range(iterations):
+            assignment = self._assign(data, centroids)
+            order = np.argsort(assignment, kind="stable")
+            filled, starts = np.unique(assignment[order], return_index=True)
+            sums = [block.sum(axis=0) for block in np.split(data[order], starts[1:])]
+            centroids[filled] = normalize(sums)  # listas vazias mantêm o centróide anterior
+
+        assignment = np.empty(count, dtype=np.int32)
+        step = self._block_rows()
+        for start in range(0, count, step):
+            assignment[start:start + step] = self._assign(vectors[start:start + step].astype(np.float32), centroids)
+        order = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.searchsorted(assignment[order], np.arange(nlist + 1))
+
+        np.save(os.path.join(self.directory, "ivf_centroids.npy"), centroids)
+        np.save(os.path.join(self.directory, "ivf_order.npy"), order)
+        np.save(os.path.join(self.directory, "ivf_offsets.npy"), offsets)
+        with self._lock:
+            self.meta["ivf_count"] = count
+            self._save_meta()
+        self._ivf = None
+        return nlist
+
+    def _assign(self, data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assignment = np.empty(len(data), dtype=np.int32)
+        step = max(1, SEARCH_BLOCK_BYTES // (4 * len(centroids)))
+        for start in range(0, len(data), step):
+            assignment[start:start + step] = np.argmax(data[start:start + step] @ centroids.T, axis=1)
+        return assignment
+
+    def _load_ivf(self) -> bool:
+        if self._ivf is None and self.meta.get("ivf_count"):
+            path = os.path.join(self.directory, "ivf_centroids.npy")
+            if os.path.exists(path):
+                self._ivf = (
+                    np.load(path),
+                    np.load(os.path.join(self.directory, "ivf_order.npy"), mmap_mode="r"),
+                    np.load(os.path.join(self.directory, "ivf_offsets.npy")),
+                )
+        return self._ivf is not None
+
+    def _search_ivf(self, query: np.ndarray, k: int, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        centroids, order, offsets = self._ivf
+        nprobe = min(nprobe, len(centroids))
+        probes = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.sort(np.concatenate([order[offsets[p]:offsets[p + 1]] for p in probes]))
+        scores = self.vectors()[rows].astype(np.float32, copy=False) @ query
+        scores[self._deleted[rows]] = -np.inf
+        best_scores, best_rows = _top_k(scores, rows, k)
+
+        ivf_count = self.meta["ivf_count"]
+        if ivf_count < self.count:  # linhas adicionadas depois do build_ivf: busca exata só nelas
+            tail_scores, tail_rows = self._scan(query, k, ivf_count, self.count)
+            best_scores, best_rows = _top_k(np.concatenate([best_scores, tail_scores]),
+                                            np.concatenate([best_rows, tail_rows]), k)
+        return best_scores, best_rows
+
+    def documents(self, rows: Sequence[int]) -> List[Tuple[str, str, dict]]:
+        """(id, texto, metadados) de cada linha, na ordem pedida"""
+        if not rows:
+            return []
+        found = {}
+        query = f"SELECT row, id, text, metadata FROM docs WHERE row IN ({','.join('?' * len(rows))})"
+        for row, doc_id, text, metadata in self._conn.execute(query, list(rows)):
+            found[row] = (doc_id, text or "", json.loads(metadata or "{}"))
+        return [found[row] for row in rows if row in found]
+
+    def compact(self):
+        """Regrava o arquivo de vetores sem as linhas apagadas (o IVF precisa ser refeito depois).
+
+        O novo arquivo é gravado ao lado do atual e a renumeração no SQLite é
+        confirmada junto com uma entrada em `journal`; só então os arquivos são
+        trocados. Se o processo cair no meio, _recover() termina a troca ou
+        descarta o arquivo novo, conforme o commit tenha acontecido ou não.
+        """
+        with self._lock:
+            keep = np.flatnonzero(~self._deleted)
+            vectors = self.vectors()
+            step = self._block_rows()
+            with open(self._compact_path, "wb") as f:
+                for start in range(0, len(keep), step):
+                    f.write(np.ascontiguousarray(vectors[keep[start:start + step]]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._conn.execute("DELETE FROM docs WHERE deleted = 1")
+            self._conn.execute("UPDATE docs SET row = -row - 1")  # evita colisões de chave ao renumerar
+            self._conn.executemany("UPDATE docs SET row = ? WHERE row = ?",
+                                   [(new, -int(old) - 1) for new, old in enumerate(keep)])
+            self._conn.execute("INSERT OR REPLACE INTO journal VALUES ('compact', ?)", (len(keep),))
+            self._conn.commit()
+
+            self._vectors = None
+            os.replace(self._compact_path, self._vectors_path)
+            self.meta["count"] = len(keep)
+            self.meta["ivf_count"] = 0
+            self._save_meta()
+            self._conn.execute("DELETE FROM journal WHERE operation = 'compact'")
+            self._conn.commit()
+            self._deleted = np.zeros(len(keep), dtype=bool)
+            self._ivf = None
+
+    def optimize(self, ivf_min_rows: int = IVF_MIN_ROWS) -> bool:
+        """Compacta se há muitas linhas apagadas e (re)constrói o IVF se o índice é grande; True se mudou algo"""
+        changed = False
+        if self.count and self.count - len(self) > COMPACT_RATIO * self.count:
+            self.compact()
+            changed = True
+        if len(self) >= ivf_min_rows and self.count - self.meta.get("ivf_count", 0) > IVF_STALE_RATIO * self.count:
+            self.build_ivf()
+            changed = True
+        return changed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MmapVectorStore(VectorStore):
+    """Adaptador LangChain do VectorIndex (add_documents, similarity_search, as_retriever, ...).
+
+    Usa o IVF com `nprobe` listas quando o índice já tem um; caso contrário, busca exata.
+    """
+
+    def __init__(self, directory: str, embedding, dtype: str = DEFAULT_DTYPE, nprobe: Optional[int] = DEFAULT_NPROBE):
+        self.index = VectorIndex(directory, dtype=dtype)
+        self._embedding = embedding
+        self.nprobe = nprobe
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in texts]
+        if texts:
+            self.index.add(ids, self._embedding.embed_documents(texts), texts, metadatas)
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids:
+            self.index.delete(ids)
+        return True
+
+    def persist(self):
+        """Cada add/delete já vai para o disco; aqui só compactamos e atualizamos o IVF quando vale a pena"""
+        self.index.optimize()
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4,
+                                               **kwargs: Any) -> List[Tuple[Document, float]]:
+        results = self.index.search(embedding, k, nprobe=kwargs.get("nprobe", self.nprobe))
+        documents = self.index.documents([row for row, _ in results])
+        return [
+            (Document(page_content=text, metadata=metadata), score)
+            for (_, text, metadata), (_, score) in zip(documents, results)
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _similarity_search_with_relevance_scores(self, query: str, k: int = 4,
+                                                 **kwargs: Any) -> List[Tuple[Document, float]]:
+        return [(doc, (score + 1) / 2) for doc, score in self.similarity_search_with_score(query, k, **kwargs)]
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding, metadatas: Optional[List[dict]] = None,
+                   ids: Optional[List[str]] = None, directory: str = "./vector_index",
+                   **kwargs: Any) -> "MmapVectorStore":
+        store = cls(directory, embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids)
+        return store